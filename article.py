@@ -3,16 +3,66 @@ Article implementation
 """
 import json
 import os
+import re
 import datetime
+from collections import OrderedDict
 
-from constants import ASSETS_PATH
+import numpy as np
+
+from constants import ASSETS_PATH, META_STORE_PATH
+from dataset_layout import get_article_file_path, is_sharded
+from meta_store import open_meta_store, uses_meta_store
+
+WRITE_BUFFER_SIZE = 1024 * 1024
+# dates of meta files are written as "%Y-%m-%d %H:%M:%S" and nothing else is accepted
+DATE_PATTERN = re.compile(r'\d{4}-\d{2}-\d{2} \d{2}:\d{2}:\d{2}', re.ASCII)
+DATE_LENGTH = 19
+# positions and codes of separators in dates, all other characters are digits
+DATE_SEPARATORS = {4: ord('-'), 7: ord('-'), 10: ord(' '), 13: ord(':'), 16: ord(':')}
+# total number of characters of texts kept in memory by TextCache
+TEXT_CACHE_SIZE = 64 * 1024 * 1024
+
+
+class MetaDateError(ValueError):
+    """
+    Custom error
+    """
 
 
 def date_from_meta(date_txt):
     """
     Converts text date to datetime object
     """
-    return datetime.datetime.strptime(date_txt, "%Y-%m-%d %H:%M:%S")
+    if not isinstance(date_txt, str) or not DATE_PATTERN.fullmatch(date_txt):
+        raise MetaDateError('date {!r} does not match YYYY-MM-DD HH:MM:SS'.format(date_txt))
+    try:
+        return datetime.datetime.fromisoformat(date_txt)
+    except ValueError as error:
+        raise MetaDateError('date {!r} is not valid: {}'.format(date_txt, error)) from error
+
+
+def dates_from_meta(date_texts) -> np.ndarray:
+    """
+    Converts text dates to an array of datetime64 with seconds precision, checking all of them at once
+    """
+    texts = np.asarray(list(date_texts), dtype=str)
+    if not texts.size:
+        return np.array([], dtype='datetime64[s]')
+    codes = texts.astype('U{}'.format(DATE_LENGTH)).view(np.uint32).reshape(len(texts), DATE_LENGTH)
+    digit_columns = [column for column in range(DATE_LENGTH) if column not in DATE_SEPARATORS]
+    valid = (np.char.str_len(texts) == DATE_LENGTH) \
+        & (codes[:, list(DATE_SEPARATORS)] == list(DATE_SEPARATORS.values())).all(axis=1) \
+        & ((codes[:, digit_columns] >= ord('0')) & (codes[:, digit_columns] <= ord('9'))).all(axis=1)
+    if valid.all():
+        try:
+            return texts.astype('datetime64[s]')
+        except ValueError:
+            # a field is out of range, the wrong date is reported below
+            pass
+    # the first wrong date is found one by one to report it
+    for date_txt in texts.tolist():
+        date_from_meta(date_txt)
+    raise MetaDateError('dates are not valid')
 
 
 class Article:
@@ -20,6 +70,11 @@ class Article:
     Article class implementation.
     Stores article metadata and knows how to work with articles
     """
+    # MetaStore that receives meta data instead of N_meta.json files when it is set
+    meta_store = None
+    # layout of the articles folder resolved by the owner of the article, None means it is checked for each path
+    sharded = None
+
     def __init__(self, url, article_id):
         self.url = url
         self.article_id = article_id
@@ -32,14 +87,22 @@ class Article:
 
     def save_raw(self):
         """
-        Saves raw text and article meta data
+        Saves raw text and article meta data, meta data is appended to the meta store when it is set
         """
-        article_meta_name = "{}_meta.json".format(self.article_id)
+        sharded = self._is_sharded()
+        raw_text_path = get_article_file_path(ASSETS_PATH, self.article_id, 'raw.txt', sharded)
+        # in the sharded layout the article may be the first one in its folder
+        if sharded:
+            os.makedirs(os.path.dirname(raw_text_path), exist_ok=True)
 
-        with open(self._get_raw_text_path(), 'w', encoding='utf-8') as file:
+        with open(raw_text_path, 'w', encoding='utf-8') as file:
             file.write(self.text)
 
-        with open(os.path.join(ASSETS_PATH, article_meta_name), "w", encoding='utf-8') as file:
+        if self.meta_store is not None:
+            self.meta_store.put(self._get_meta())
+            return
+        with open(get_article_file_path(ASSETS_PATH, self.article_id, 'meta.json', sharded), "w",
+                  encoding='utf-8') as file:
             json.dump(self._get_meta(),
                       file,
                       sort_keys=False,
@@ -75,6 +138,25 @@ class Article:
         with open(self._get_raw_text_path(), encoding='utf-8') as file:
             return file.read()
 
+    def get_raw_text_size(self):
+        """
+        Gets a size of raw text file in bytes
+        """
+        return os.path.getsize(self._get_raw_text_path())
+
+    def has_processed_text(self):
+        """
+        Checks whether processed text of the article is saved
+        """
+        return os.path.exists(self._get_processed_text_path())
+
+    def get_processed_text(self):
+        """
+        Gets a processed text for requested article
+        """
+        with open(self._get_processed_text_path(), encoding='utf-8') as file:
+            return file.read()
+
     def save_processed(self, processed_text):
         """
         Saves processed article text
@@ -82,6 +164,19 @@ class Article:
         with open(self._get_processed_text_path(), 'w', encoding='utf-8') as file:
             file.write(processed_text)
 
+    def save_processed_fragments(self, fragments):
+        """
+        Saves processed article text given by parts, writes them as soon as they are produced
+        """
+        with open(self._get_processed_text_path(), 'w', encoding='utf-8', buffering=WRITE_BUFFER_SIZE) as file:
+            file.writelines(fragments)
+
+    def open_raw_text(self):
+        """
+        Opens raw text of the article to read it by parts
+        """
+        return open(self._get_raw_text_path(), encoding='utf-8')
+
     def _get_meta(self):
         """
         Gets all article params
@@ -101,16 +196,138 @@ class Article:
         """
         return self.date.strftime("%Y-%m-%d %H:%M:%S")
     
+    def _is_sharded(self):
+        return is_sharded(ASSETS_PATH) if self.sharded is None else self.sharded
+
+    def _get_meta_path(self):
+        """
+        Returns path for requested article meta data
+        """
+        return get_article_file_path(ASSETS_PATH, self.article_id, 'meta.json', self._is_sharded())
+
     def _get_raw_text_path(self):
         """
         Returns path for requested raw article
         """
-        article_txt_name = "{}_raw.txt".format(self.article_id)
-        return os.path.join(ASSETS_PATH, article_txt_name)
+        return get_article_file_path(ASSETS_PATH, self.article_id, 'raw.txt', self._is_sharded())
 
     def _get_processed_text_path(self):
         """
         Returns path for requested processed article
         """
-        article_txt_name = "{}_processed.txt".format(self.article_id)
-        return os.path.join(ASSETS_PATH, article_txt_name)
+        return get_article_file_path(ASSETS_PATH, self.article_id, 'processed.txt', self._is_sharded())
+
+
+class TextCache:
+    """
+    LRU cache of article texts bounded by their total length
+    """
+    def __init__(self, max_size: int = TEXT_CACHE_SIZE):
+        self.max_size = max_size
+        self.size = 0
+        self._texts = OrderedDict()
+
+    def get(self, key):
+        """
+        Returns cached text or None
+        """
+        text = self._texts.get(key)
+        if text is not None:
+            self._texts.move_to_end(key)
+        return text
+
+    def put(self, key, text: str):
+        """
+        Caches text evicting the least recently used ones, texts longer than the cache are not kept
+        """
+        self.discard(key)
+        if len(text) > self.max_size:
+            return
+        self._texts[key] = text
+        self.size += len(text)
+        while self.size > self.max_size:
+            _, evicted = self._texts.popitem(last=False)
+            self.size -= len(evicted)
+
+    def discard(self, key):
+        """
+        Removes text from the cache
+        """
+        text = self._texts.pop(key, None)
+        if text is not None:
+            self.size -= len(text)
+
+
+class CachedArticle(Article):
+    """
+    Article that keeps its texts in a shared TextCache and reads meta data only when asked to
+    """
+    def __init__(self, article_id, text_cache: TextCache = None, sharded: bool = None, meta_stored: bool = None):
+        super().__init__(url=None, article_id=article_id)
+        self.text_cache = text_cache
+        self.sharded = sharded
+        # whether meta data is kept in the meta store, None means it is checked on disk
+        self.meta_stored = meta_stored
+
+    def __getstate__(self):
+        # the cache is not sent to other processes together with the article
+        state = self.__dict__.copy()
+        state['text_cache'] = None
+        return state
+
+    def load_meta(self):
+        """
+        Reads meta data of the article from the meta store if the dataset keeps it there, or from its meta file.
+        The store has all updates of the article, so its meta file is not read even if it exists
+        """
+        meta_stored = uses_meta_store(ASSETS_PATH) if self.meta_stored is None else self.meta_stored
+        if meta_stored:
+            meta = open_meta_store(META_STORE_PATH).get(self.article_id)
+            if meta is None:
+                raise FileNotFoundError('{} has no meta data of article {}'.format(META_STORE_PATH, self.article_id))
+        else:
+            with open(self._get_meta_path(), encoding='utf-8') as meta_file:
+                meta = json.load(meta_file)
+        self.url = meta.get('url')
+        self.title = meta.get('title', '')
+        self.date = date_from_meta(meta['date']) if meta.get('date') else None
+        self.author = meta.get('author', '')
+        self.topics = meta.get('topics', [])
+        return self
+
+    def get_raw_text(self):
+        """
+        Gets a raw text for requested article from the cache or the file
+        """
+        return self._get_cached('raw', super().get_raw_text)
+
+    def get_processed_text(self):
+        """
+        Gets a processed text for requested article from the cache or the file
+        """
+        return self._get_cached('processed', super().get_processed_text)
+
+    def save_processed(self, processed_text):
+        """
+        Saves processed article text and keeps it in the cache
+        """
+        super().save_processed(processed_text)
+        if self.text_cache is not None:
+            self.text_cache.put((self.article_id, 'processed'), processed_text)
+
+    def save_processed_fragments(self, fragments):
+        """
+        Saves processed article text given by parts
+        """
+        super().save_processed_fragments(fragments)
+        if self.text_cache is not None:
+            self.text_cache.discard((self.article_id, 'processed'))
+
+    def _get_cached(self, kind, read_text):
+        if self.text_cache is None:
+            return read_text()
+        text = self.text_cache.get((self.article_id, kind))
+        if text is None:
+            text = read_text()
+            self.text_cache.put((self.article_id, kind), text)
+        return text
@@ -0,0 +1,64 @@
+import unittest
+from config.local_server import serve
+from scrapper import AsyncFetcher, Crawler
+
+
+SEED_PAGE = '<html><body>{}</body></html>'
+ARTICLE_PAGE = '<html><body><h1>Article {}</h1><p>Text</p></body></html>'
+
+
+def make_site(num_seeds, articles_per_seed):
+    pages = {}
+    for seed in range(num_seeds):
+        links = ''.join('<a href="/article/{}-{}">link</a>'.format(seed, i)
+                        for i in range(articles_per_seed))
+        pages['/seed/{}'.format(seed)] = SEED_PAGE.format(links)
+        for i in range(articles_per_seed):
+            pages['/article/{}-{}'.format(seed, i)] = ARTICLE_PAGE.format(i)
+    return pages
+
+
+def fetch_all(fetcher, urls):
+    fetched = {}
+    fetcher.download(urls, lambda page: fetched.__setitem__(page.url, page.text))
+    return fetched
+
+
+class AsyncFetcherTest(unittest.TestCase):
+    def test_fetches_all_pages(self):
+        pages = make_site(num_seeds=2, articles_per_seed=5)
+        with serve(pages) as server:
+            urls = [server.url(path) for path in pages]
+            fetched = fetch_all(AsyncFetcher(max_concurrency=4, max_per_host=4), urls)
+        self.assertEqual(set(urls), set(fetched))
+        self.assertEqual(pages['/seed/0'], fetched[urls[0]])
+
+    def test_per_host_limit_is_respected(self):
+        pages = make_site(num_seeds=1, articles_per_seed=8)
+        with serve(pages, delay=0.05) as server:
+            urls = [server.url(path) for path in pages]
+            AsyncFetcher(max_concurrency=8, max_per_host=2).download(urls, lambda page: None)
+            self.assertLessEqual(server.max_active, 2)
+            self.assertEqual(len(urls), len(server.requested))
+
+    def test_failed_pages_are_skipped(self):
+        with serve({'/ok': 'ok'}) as server:
+            fetched = fetch_all(AsyncFetcher(), [server.url('/ok'), server.url('/missing')])
+        self.assertEqual([server.url('/ok')], list(fetched))
+
+
+class CrawlerFindArticlesTest(unittest.TestCase):
+    def test_respects_article_limits(self):
+        pages = make_site(num_seeds=3, articles_per_seed=5)
+        with serve(pages) as server:
+            seeds = [server.url('/seed/{}'.format(seed)) for seed in range(3)]
+            crawler = Crawler(seeds, max_articles=7, max_articles_per_seed=3)
+            crawler.find_articles()
+        self.assertEqual(7, len(crawler.urls))
+        self.assertEqual(len(crawler.urls), len(set(crawler.urls)))
+        for url in crawler.urls:
+            self.assertIn('/article/', url)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,128 @@
+import asyncio
+import os
+import shutil
+import tempfile
+import unittest
+from config.async_fetch_test import make_site
+from config.local_server import serve
+from config.recursive_crawler_test import WebsiteCrawler, make_website
+from scrapper import AsyncFetcher, CrawlCheckpoint, Crawler, resume_crawl
+
+
+class CrawlCheckpointTest(unittest.TestCase):
+    def setUp(self) -> None:
+        self.state_dir = tempfile.mkdtemp()
+        self.path = os.path.join(self.state_dir, 'checkpoint.sqlite')
+
+    def tearDown(self) -> None:
+        shutil.rmtree(self.state_dir)
+
+    def test_nothing_to_restore(self):
+        self.assertFalse(CrawlCheckpoint(self.path).restore(Crawler([], 10)))
+
+    def test_interrupted_recursive_crawl_is_resumed(self):
+        pages = make_website(20)
+        with serve(pages) as server:
+            crawler = WebsiteCrawler([server.url('/page/0')], max_articles=100,
+                                     fetcher=AsyncFetcher(max_concurrency=2),
+                                     frontier_path=os.path.join(self.state_dir, 'frontier.tsv'))
+            crawler.checkpoint = CrawlCheckpoint(self.path, interval=0)
+
+            async def crawl_until_stopped():
+                async for url in crawler.iter_articles():
+                    if len(crawler.urls) >= 8:
+                        return url
+                return None
+
+            asyncio.run(crawl_until_stopped())
+            visited_before = len(server.requested)
+
+            # new process: state is loaded from the checkpoint file only
+            resumed = WebsiteCrawler([server.url('/page/0')], max_articles=100,
+                                     frontier_path=os.path.join(self.state_dir, 'resumed_frontier.tsv'))
+            checkpoint = CrawlCheckpoint(self.path)
+            self.assertTrue(checkpoint.restore(resumed))
+            self.assertFalse(checkpoint.crawl_done)
+            resumed.checkpoint = checkpoint
+            self.assertLessEqual(resumed.visited_pages, visited_before)
+            resumed.find_articles()
+
+            self.assertLess(visited_before, len(pages))
+            self.assertEqual(sorted(pages), sorted(set(server.requested)))
+            # only the batch that was in progress is downloaded again
+            self.assertLessEqual(len(server.requested), len(pages) + 2)
+        self.assertTrue(checkpoint.crawl_done)
+        self.assertEqual(19, len(resumed.urls))
+        self.assertEqual(len(resumed.urls), len(set(resumed.urls)))
+
+    def test_interrupted_crawl_is_resumed(self):
+        pages = {'/seed/{}'.format(seed): ''.join('<a href="/article/{}/{}">link</a>'.format(seed, link)
+                                                  for link in range(3))
+                 for seed in range(4)}
+        with serve(pages) as server:
+            seed_urls = [server.url(path) for path in sorted(pages)]
+            crawler = Crawler(seed_urls, 8, 3, AsyncFetcher(max_concurrency=1))
+            crawler.checkpoint = CrawlCheckpoint(self.path, interval=0)
+
+            async def crawl_until_stopped():
+                async for _ in crawler.iter_articles():
+                    if len(crawler.urls) >= 5:
+                        return
+
+            asyncio.run(crawl_until_stopped())
+
+            resumed = Crawler(seed_urls, 8, 3, AsyncFetcher(max_concurrency=1))
+            checkpoint = CrawlCheckpoint(self.path)
+            self.assertTrue(checkpoint.restore(resumed))
+            self.assertFalse(checkpoint.crawl_done)
+            self.assertEqual(3, len(resumed.urls))
+            resumed.checkpoint = checkpoint
+            resumed.find_articles()
+        self.assertTrue(checkpoint.crawl_done)
+        self.assertEqual(8, len(resumed.urls))
+        self.assertEqual(len(resumed.urls), len(set(resumed.urls)))
+
+    def test_saved_articles_count_against_cap(self):
+        with serve(make_site(num_seeds=1, articles_per_seed=8)) as server:
+            saved = {server.url('/article/0-{}'.format(link)): link + 1 for link in range(3)}
+
+            # the crawl stopped before its first checkpoint
+            crawler = Crawler([server.url('/seed/0')], max_articles=5)
+            urls = asyncio.run(self._collect(resume_crawl(crawler, CrawlCheckpoint(self.path), saved)))
+            self.assertEqual(2, len(urls))
+            self.assertFalse(set(saved) & set(urls))
+
+            # articles parsed after the last checkpoint are not in it
+            checkpoint = CrawlCheckpoint(self.path)
+            found = Crawler([server.url('/seed/0')], max_articles=6)
+            found.urls = [server.url('/article/0-{}'.format(link)) for link in range(4)]
+            checkpoint.save(found)
+            saved[server.url('/article/0-5')] = 4
+            crawler = Crawler([server.url('/seed/0')], max_articles=6)
+            crawler.checkpoint = checkpoint
+            urls = asyncio.run(self._collect(resume_crawl(crawler, checkpoint, saved)))
+        self.assertEqual([server.url('/article/0-{}'.format(link)) for link in (3, 4)], urls)
+
+    @staticmethod
+    async def _collect(urls):
+        if isinstance(urls, list):
+            return urls
+        return [url async for url in urls]
+
+    def test_finished_crawl(self):
+        crawler = Crawler(['http://site/'], 10)
+        crawler.urls = ['http://site/1', 'http://site/2']
+        checkpoint = CrawlCheckpoint(self.path)
+        checkpoint.save(crawler, crawl_done=True)
+
+        restored = Crawler(['http://site/'], 10)
+        self.assertTrue(checkpoint.restore(restored))
+        self.assertTrue(checkpoint.crawl_done)
+        self.assertEqual(crawler.urls, restored.urls)
+
+        checkpoint.clear()
+        self.assertFalse(checkpoint.restore(restored))
+
+
+if __name__ == "__main__":
+    unittest.main()
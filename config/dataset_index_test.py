@@ -0,0 +1,85 @@
+import os
+import shutil
+import tempfile
+import time
+import unittest
+from unittest import mock
+from pipeline import CorpusManager, DatasetIndex, EmptyDirectoryError, InconsistentDatasetError, \
+    UnknownDatasetError, get_dataset_index, validate_dataset
+
+
+class DatasetIndexTest(unittest.TestCase):
+    def setUp(self) -> None:
+        self.assets = tempfile.mkdtemp()
+        self.state = tempfile.mkdtemp()
+        self.index_path = os.path.join(self.state, 'pipeline', 'index.json')
+        patcher = mock.patch('pipeline.DATASET_INDEX_PATH', self.index_path)
+        patcher.start()
+        self.addCleanup(patcher.stop)
+        for file_name in ('1_raw.txt', '1_meta.json', '1_processed.txt', '1_image.png', '2_raw.txt', '2_meta.json'):
+            self._touch(file_name)
+        self._age_folder()
+
+    def tearDown(self) -> None:
+        shutil.rmtree(self.assets)
+        shutil.rmtree(self.state)
+
+    def _touch(self, file_name):
+        with open(os.path.join(self.assets, file_name), 'w', encoding='utf-8'):
+            pass
+
+    def _age_folder(self, seconds=60):
+        past = time.time() - seconds
+        os.utime(self.assets, (past, past))
+
+    def test_scan_collects_kinds(self):
+        self._touch('notes.txt')
+        os.mkdir(os.path.join(self.assets, 'images'))
+        index = DatasetIndex(self.assets)
+        index.scan()
+        self.assertEqual({1: {'raw', 'meta', 'processed', 'image'}, 2: {'raw', 'meta'}}, index.articles)
+        self.assertEqual(['notes.txt'], index.unknown_files)
+        self.assertEqual(['images'], index.directories)
+        self.assertEqual([1], index.get_ids('processed'))
+
+    def test_index_is_reused_until_folder_changes(self):
+        self.assertEqual([1, 2], get_dataset_index(self.assets).get_ids('raw'))
+        self.assertTrue(os.path.exists(self.index_path))
+        with mock.patch.object(DatasetIndex, 'scan') as scan:
+            self.assertEqual([1, 2], CorpusManager(self.assets).dataset_index.get_ids('raw'))
+            validate_dataset(self.assets)
+        scan.assert_not_called()
+
+        self._touch('3_raw.txt')
+        self._touch('3_meta.json')
+        self._age_folder(30)
+        self.assertEqual([1, 2, 3], sorted(CorpusManager(self.assets).get_articles()))
+
+    def test_recently_changed_folder_is_not_cached(self):
+        self._touch('3_raw.txt')
+        self.assertEqual([1, 2, 3], get_dataset_index(self.assets).get_ids('raw'))
+        self.assertFalse(os.path.exists(self.index_path))
+
+    def test_validation_errors(self):
+        validate_dataset(self.assets)
+        with self.assertRaises(FileNotFoundError):
+            validate_dataset(os.path.join(self.assets, 'missing'))
+        with self.assertRaises(NotADirectoryError):
+            validate_dataset(os.path.join(self.assets, '1_raw.txt'))
+
+        empty = os.path.join(self.state, 'empty')
+        os.mkdir(empty)
+        with self.assertRaises(EmptyDirectoryError):
+            validate_dataset(empty)
+
+        os.remove(os.path.join(self.assets, '2_meta.json'))
+        with self.assertRaises(InconsistentDatasetError):
+            validate_dataset(self.assets)
+        self._touch('2_meta.json')
+        self._touch('4_raw.txt')
+        self._touch('4_meta.json')
+        with self.assertRaises(InconsistentDatasetError):
+            validate_dataset(self.assets)
+        os.mkdir(os.path.join(self.assets, 'images'))
+        with self.assertRaises(UnknownDatasetError):
+            validate_dataset(self.assets)
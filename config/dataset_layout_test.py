@@ -0,0 +1,118 @@
+import datetime
+import os
+import shutil
+import tempfile
+import time
+import unittest
+from unittest import mock
+from article import Article
+from dataset_layout import SHARDED_MARKER, convert_to_flat, convert_to_sharded, get_article_file_path, \
+    get_shard_dir, is_sharded
+from pipeline import CorpusManager, InconsistentDatasetError, get_dataset_index, validate_dataset
+from scrapper import build_url_index
+
+
+class DatasetLayoutTest(unittest.TestCase):
+    def setUp(self) -> None:
+        self.assets = tempfile.mkdtemp()
+        patchers = [mock.patch('article.ASSETS_PATH', self.assets),
+                    mock.patch('pipeline.DATASET_INDEX_PATH', os.path.join(tempfile.gettempdir(), 'no', 'index'))]
+        for patcher in patchers:
+            patcher.start()
+            self.addCleanup(patcher.stop)
+        for article_id in (1, 2, 3):
+            article = Article('http://site/{}'.format(article_id), article_id)
+            article.text = 'Текст {}'.format(article_id)
+            article.date = datetime.datetime(2021, 3, 1)
+            article.save_raw()
+        self.files = self._list_files()
+
+    def tearDown(self) -> None:
+        shutil.rmtree(self.assets)
+
+    def _list_files(self):
+        files = {}
+        for folder, _, file_names in os.walk(self.assets):
+            for file_name in file_names:
+                with open(os.path.join(folder, file_name), encoding='utf-8') as file:
+                    files[file_name] = file.read()
+        files.pop(SHARDED_MARKER, None)
+        return files
+
+    def test_shard_dir(self):
+        self.assertEqual(os.path.join('00', '12'), get_shard_dir(1234))
+        self.assertEqual(os.path.join('00', '00'), get_shard_dir(1))
+        self.assertEqual(os.path.join('1234', '56'), get_shard_dir(12345678))
+
+    def test_conversion_round_trip(self):
+        convert_to_sharded(self.assets)
+        self.assertTrue(is_sharded(self.assets))
+        self.assertTrue(os.path.exists(os.path.join(self.assets, '00', '00', '3_raw.txt')))
+        self.assertEqual(self.files, self._list_files())
+        self.assertEqual('Текст 3', Article(None, 3).get_raw_text())
+        validate_dataset(self.assets)
+        self.assertEqual([1, 2, 3], sorted(CorpusManager(self.assets).get_articles()))
+        self.assertEqual({'http://site/1': 1, 'http://site/2': 2, 'http://site/3': 3},
+                         build_url_index(self.assets))
+
+        convert_to_flat(self.assets)
+        self.assertFalse(is_sharded(self.assets))
+        self.assertEqual(sorted(self.files), sorted(os.listdir(self.assets)))
+        self.assertEqual(self.files, self._list_files())
+        validate_dataset(self.assets)
+
+    def test_sharded_dataset_is_written_to_shards(self):
+        convert_to_sharded(self.assets)
+        article = Article('http://site/20000', 20000)
+        article.text = 'Новая'
+        article.date = datetime.datetime(2021, 3, 1)
+        article.save_raw()
+        article.save_processed('новый<A>')
+        self.assertEqual(os.path.join(self.assets, '02', '00', '20000_processed.txt'),
+                         get_article_file_path(self.assets, 20000, 'processed.txt'))
+        self.assertEqual('новый<A>', article.get_processed_text())
+        self.assertEqual({'processed', 'raw', 'meta'}, get_dataset_index(self.assets).articles[20000])
+
+    def test_layout_is_resolved_once(self):
+        convert_to_sharded(self.assets)
+        articles = CorpusManager(self.assets).get_articles()
+        with mock.patch('dataset_layout.is_sharded', wraps=is_sharded) as check, \
+                mock.patch('article.is_sharded', wraps=is_sharded) as article_check:
+            self.assertEqual('Текст 2', articles[2].get_raw_text())
+            articles[2].save_processed('текст<S>')
+            self.assertTrue(articles[2].has_processed_text())
+            self.assertEqual(0, check.call_count + article_check.call_count)
+
+            article = Article('http://site/4', 4)
+            article.text = 'Текст 4'
+            article.date = datetime.datetime(2021, 3, 1)
+            article.save_raw()
+            self.assertEqual(1, check.call_count + article_check.call_count)
+        self.assertTrue(os.path.exists(os.path.join(self.assets, '00', '00', '4_meta.json')))
+
+    def test_misplaced_files_are_inconsistent(self):
+        convert_to_sharded(self.assets)
+        os.makedirs(os.path.join(self.assets, '00', '12'))
+        os.replace(os.path.join(self.assets, '00', '00', '3_meta.json'),
+                   os.path.join(self.assets, '00', '12', '3_meta.json'))
+        index = get_dataset_index(self.assets)
+        self.assertEqual([os.path.join('00', '12', '3_meta.json')], index.unknown_files)
+        with self.assertRaises(InconsistentDatasetError):
+            validate_dataset(self.assets)
+
+    def test_cached_index_notices_changes_in_shards(self):
+        state = tempfile.mkdtemp()
+        self.addCleanup(shutil.rmtree, state)
+        index_path = os.path.join(state, 'index.json')
+        convert_to_sharded(self.assets)
+        past = time.time() - 60
+        for folder, _, _ in os.walk(self.assets):
+            os.utime(folder, (past, past))
+        with mock.patch('pipeline.DATASET_INDEX_PATH', index_path):
+            self.assertEqual([1, 2, 3], get_dataset_index(self.assets).get_ids('raw'))
+            self.assertTrue(os.path.exists(index_path))
+            with mock.patch('pipeline.DatasetIndex.scan') as scan:
+                self.assertEqual([1, 2, 3], get_dataset_index(self.assets).get_ids('raw'))
+            scan.assert_not_called()
+            os.remove(os.path.join(self.assets, '00', '00', '2_raw.txt'))
+            self.assertEqual([1, 3], get_dataset_index(self.assets).get_ids('raw'))
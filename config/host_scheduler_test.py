@@ -0,0 +1,99 @@
+import asyncio
+import time
+import unittest
+from config.local_server import serve
+from scrapper import AsyncFetcher, HostScheduler
+
+
+ROBOTS = """User-agent: *
+Disallow: /private/
+Crawl-delay: 1
+"""
+
+
+def make_fetcher(scheduler):
+    fetcher = AsyncFetcher()
+    fetcher.scheduler = scheduler
+    return fetcher
+
+
+class HostSchedulerTest(unittest.TestCase):
+    def test_robots_rules_and_crawl_delay(self):
+        pages = {'/robots.txt': ROBOTS, '/private/1': 'secret'}
+        pages.update({'/news/{}'.format(i): 'news' for i in range(2)})
+        with serve(pages) as server:
+            fetched = []
+            scheduler = HostScheduler(rate=100)
+            make_fetcher(scheduler).download([server.url(path) for path in pages if path != '/robots.txt'],
+                                             fetched.append)
+            self.assertNotIn('/private/1', server.requested)
+            self.assertEqual(2, len(fetched))
+            times = server.request_times[1:]
+            self.assertGreaterEqual(times[-1] - times[0], 0.9)
+
+    def test_crawl_delay_allows_no_burst_after_idle_time(self):
+        with serve({'/robots.txt': ROBOTS, '/news/0': 'news'}) as server:
+            scheduler = HostScheduler(rate=100)
+            url = server.url('/news/0')
+
+            async def acquire_after_idle_time():
+                await scheduler.acquire(url)
+                scheduler._hosts[server.url('')[len('http://'):]]['updated_at'] -= 10
+                start = time.monotonic()
+                for _ in range(2):
+                    await scheduler.acquire(url)
+                return time.monotonic() - start
+
+            self.assertGreaterEqual(asyncio.run(acquire_after_idle_time()), 0.9)
+
+    def test_slow_robots_do_not_hold_up_other_hosts(self):
+        with serve({'/news/0': 'news'}, delay=1) as slow, serve({'/news/0': 'news'}) as fast:
+            scheduler = HostScheduler(rate=100)
+
+            async def acquire_both():
+                slow_acquire = asyncio.ensure_future(scheduler.acquire(slow.url('/news/0')))
+                await asyncio.sleep(0.1)
+                start = time.monotonic()
+                await scheduler.acquire(fast.url('/news/0'))
+                elapsed = time.monotonic() - start
+                await slow_acquire
+                return elapsed
+
+            self.assertLess(asyncio.run(acquire_both()), 0.5)
+
+    def test_backs_off_and_retries_throttled_pages(self):
+        pages = {'/news/{}'.format(i): 'news' for i in range(3)}
+        with serve(pages) as server:
+            server.throttled = {'/news/0': 2, '/news/1': 1}
+            scheduler = HostScheduler(rate=1000, burst=10)
+            scheduler.backoff_base = 0.05
+            fetched = []
+            make_fetcher(scheduler).download([server.url(path) for path in pages], fetched.append)
+            self.assertEqual(3, len(fetched))
+            self.assertEqual(3, server.requested.count('/news/0'))
+            host = scheduler._hosts[server.url('')[len('http://'):]]
+            self.assertLess(host['rate'], host['max_rate'])
+            self.assertEqual(0, host['failures'])
+
+    def test_throttled_page_is_not_retried_without_scheduler(self):
+        with serve({'/news/0': 'news', '/news/1': 'news'}) as server:
+            server.throttled = {'/news/0': 3}
+            fetched = []
+            make_fetcher(None).download([server.url('/news/0'), server.url('/news/1')], fetched.append)
+            self.assertEqual(['news'], [page.text for page in fetched])
+            self.assertEqual(1, server.requested.count('/news/0'))
+
+    def test_rate_recovers_after_successes(self):
+        scheduler = HostScheduler(rate=10)
+        scheduler._hosts['site'] = {'max_rate': 10, 'rate': 10, 'burst': 5, 'tokens': 1.0,
+                                    'updated_at': 0.0, 'blocked_until': 0.0, 'failures': 0}
+        scheduler.report('http://site/a', 503)
+        scheduler.report('http://site/a', 429)
+        self.assertEqual(2.5, scheduler._hosts['site']['rate'])
+        for _ in range(10):
+            scheduler.report('http://site/a', 200)
+        self.assertEqual(10, scheduler._hosts['site']['rate'])
+
+
+if __name__ == "__main__":
+    unittest.main()
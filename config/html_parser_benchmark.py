@@ -0,0 +1,68 @@
+"""
+Compares BeautifulSoup parsers on saved article pages.
+By default takes pages stored in the scrapper response cache.
+Run from the project root: python -m config.html_parser_benchmark
+"""
+
+import argparse
+import json
+import os
+import time
+from bs4 import BeautifulSoup, FeatureNotFound
+from constants import CACHE_PATH
+from scrapper import HTML_PARSERS, ArticleParser, Crawler
+
+
+class BenchmarkArticleParser(ArticleParser):
+    def run_extraction(self, article_bs):
+        self._fill_article_with_text(article_bs)
+        self._fill_article_with_meta_information(article_bs)
+
+
+def load_pages(path: str) -> list:
+    pages = []
+    for file_name in sorted(os.listdir(path)):
+        file_path = os.path.join(path, file_name)
+        if file_name.endswith('.json'):
+            with open(file_path, encoding='utf-8') as f:
+                pages.append(json.load(f)['text'])
+        elif file_name.endswith('.html'):
+            with open(file_path, encoding='utf-8') as f:
+                pages.append(f.read())
+    return pages
+
+
+def benchmark(pages: list, parser_name: str, repeats: int) -> float:
+    parser = BenchmarkArticleParser(None, None)
+    start = time.perf_counter()
+    for _ in range(repeats):
+        for page in pages:
+            article_bs = BeautifulSoup(page, parser_name)
+            Crawler._extract_url(article_bs)
+            parser.run_extraction(article_bs)
+    return len(pages) * repeats / (time.perf_counter() - start)
+
+
+def main():
+    arg_parser = argparse.ArgumentParser(description='Compares HTML parsers on saved article pages')
+    arg_parser.add_argument('--pages-dir', type=str, default=CACHE_PATH,
+                            help='folder with *.html pages or scrapper cache *.json entries')
+    arg_parser.add_argument('--repeats', type=int, default=3)
+    args = arg_parser.parse_args()
+
+    pages = load_pages(args.pages_dir)
+    if not pages:
+        print('No saved pages found in {}'.format(args.pages_dir))
+        return
+    print('Parsing {} pages {} times'.format(len(pages), args.repeats))
+    for parser_name in HTML_PARSERS:
+        try:
+            pages_per_second = benchmark(pages, parser_name, args.repeats)
+        except FeatureNotFound:
+            print('{:<12} not installed'.format(parser_name))
+            continue
+        print('{:<12} {:>10.1f} pages/sec'.format(parser_name, pages_per_second))
+
+
+if __name__ == '__main__':
+    main()
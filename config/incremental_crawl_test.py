@@ -0,0 +1,41 @@
+import json
+import os
+import shutil
+import tempfile
+import unittest
+from config.async_fetch_test import make_site
+from config.local_server import serve
+from scrapper import Crawler, build_url_index, prepare_environment
+
+
+class IncrementalCrawlTest(unittest.TestCase):
+    def setUp(self) -> None:
+        self.assets = os.path.join(tempfile.mkdtemp(), 'articles')
+        os.mkdir(self.assets)
+        for article_id, url in enumerate(['http://site/1', 'http://site/2'], start=1):
+            with open(os.path.join(self.assets, '{}_meta.json'.format(article_id)), 'w', encoding='utf-8') as f:
+                json.dump({'id': article_id, 'url': url}, f)
+
+    def tearDown(self) -> None:
+        shutil.rmtree(os.path.dirname(self.assets))
+
+    def test_incremental_environment_keeps_dataset(self):
+        prepare_environment(self.assets, incremental=True)
+        self.assertEqual({'http://site/1': 1, 'http://site/2': 2}, build_url_index(self.assets))
+
+        prepare_environment(self.assets)
+        self.assertEqual({}, build_url_index(self.assets))
+
+    def test_known_urls_are_skipped(self):
+        pages = make_site(num_seeds=1, articles_per_seed=5)
+        with serve(pages) as server:
+            known = {server.url('/article/0-0'), server.url('/article/0-1')}
+            crawler = Crawler([server.url('/seed/0')], max_articles=10)
+            crawler.known_urls = known
+            crawler.find_articles()
+        self.assertEqual(3, len(crawler.urls))
+        self.assertFalse(known & set(crawler.urls))
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,59 @@
+import os
+import shutil
+import tempfile
+import unittest
+from unittest import mock
+from config.mystem_batch_test import FakeMorphAnalyzer, FakeMystem, run_pipeline
+from pipeline import CorpusManager, ProcessingManifest, TextProcessingPipeline
+
+
+class IncrementalPipelineTest(unittest.TestCase):
+    def setUp(self) -> None:
+        self.assets = tempfile.mkdtemp()
+        self.state = tempfile.mkdtemp()
+        for article_id, text in enumerate(['Мама мыла раму', 'Вторая река', 'Новая статья'], start=1):
+            self._write_raw(article_id, text)
+
+    def tearDown(self) -> None:
+        shutil.rmtree(self.assets)
+        shutil.rmtree(self.state)
+
+    def _write_raw(self, article_id, text):
+        with open(os.path.join(self.assets, '{}_raw.txt'.format(article_id)), 'w', encoding='utf-8') as file:
+            file.write(text)
+
+    def _run(self, tagging_config=None):
+        with mock.patch('pipeline.Mystem', FakeMystem), mock.patch('pipeline.MorphAnalyzer', FakeMorphAnalyzer):
+            pipeline = TextProcessingPipeline(CorpusManager(self.assets))
+        pipeline.manifest = ProcessingManifest(os.path.join(self.state, 'manifest.json'),
+                                               tagging_config={'pipeline_version': tagging_config or 1})
+        pipeline.manifest.load()
+        processed = run_pipeline(self.assets, pipeline)
+        return processed, pipeline._mystem.calls
+
+    def test_unchanged_articles_are_skipped(self):
+        processed, calls = self._run()
+        self.assertEqual(3, calls)
+        self.assertEqual((processed, 0), self._run())
+
+    def test_changed_and_missing_articles_are_processed(self):
+        self._run()
+        self._write_raw(2, 'Другая река')
+        os.remove(os.path.join(self.assets, '3_processed.txt'))
+        processed, calls = self._run()
+        self.assertEqual(2, calls)
+        self.assertEqual('другая<S>(NOUN,6) река<S>(NOUN,4)', processed[2])
+        self.assertEqual('новая<S>(NOUN,5) статья<S>(NOUN,6)', processed[3])
+
+    def test_tagging_config_change_processes_everything(self):
+        self._run()
+        self.assertEqual(3, self._run(tagging_config=2)[1])
+        self.assertEqual(0, self._run(tagging_config=2)[1])
+
+    def test_removed_articles_are_forgotten(self):
+        self._run()
+        for file_name in ('3_raw.txt', '3_processed.txt'):
+            os.remove(os.path.join(self.assets, file_name))
+        self._run()
+        self._write_raw(3, 'Новая статья')
+        self.assertEqual(1, self._run()[1])
@@ -0,0 +1,74 @@
+import datetime
+import os
+import pickle
+import shutil
+import tempfile
+import unittest
+from unittest import mock
+from article import Article, TextCache
+from pipeline import CorpusManager
+
+
+class LazyCorpusTest(unittest.TestCase):
+    def setUp(self) -> None:
+        self.assets = tempfile.mkdtemp()
+        patchers = [mock.patch('article.ASSETS_PATH', self.assets),
+                    mock.patch('pipeline.DATASET_INDEX_PATH', os.path.join(self.assets, 'no', 'index'))]
+        for patcher in patchers:
+            patcher.start()
+            self.addCleanup(patcher.stop)
+        for article_id in (1, 2, 3):
+            article = Article('http://site/{}'.format(article_id), article_id)
+            article.title = 'Статья {}'.format(article_id)
+            article.date = datetime.datetime(2021, 3, article_id, 12, 30)
+            article.text = 'Текст статьи {}'.format(article_id)
+            article.save_raw()
+
+    def tearDown(self) -> None:
+        shutil.rmtree(self.assets)
+
+    def test_articles_are_created_on_access(self):
+        articles = CorpusManager(self.assets).get_articles()
+        self.assertEqual(3, len(articles))
+        self.assertEqual({}, articles._articles)
+        self.assertIn(2, articles)
+        self.assertNotIn(4, articles)
+        with self.assertRaises(KeyError):
+            articles[4]
+        self.assertIs(articles[2], articles[2])
+        self.assertEqual([2], list(articles._articles))
+        self.assertEqual([1, 2, 3], [article_id for article_id, _ in sorted(articles.items())])
+
+    def test_meta_is_loaded_on_demand(self):
+        article = CorpusManager(self.assets).get_articles()[3]
+        self.assertIsNone(article.url)
+        article.load_meta()
+        self.assertEqual('http://site/3', article.url)
+        self.assertEqual('Статья 3', article.title)
+        self.assertEqual(datetime.datetime(2021, 3, 3, 12, 30), article.date)
+
+    def test_texts_are_cached(self):
+        article = CorpusManager(self.assets).get_articles()[1]
+        self.assertEqual('Текст статьи 1', article.get_raw_text())
+        os.remove(os.path.join(self.assets, '1_raw.txt'))
+        self.assertEqual('Текст статьи 1', article.get_raw_text())
+        article.save_processed('текст<S>')
+        os.remove(os.path.join(self.assets, '1_processed.txt'))
+        self.assertEqual('текст<S>', article.get_processed_text())
+
+        copy = pickle.loads(pickle.dumps(article))
+        self.assertIsNone(copy.text_cache)
+        self.assertIsNotNone(article.text_cache)
+
+    def test_cache_size_is_bounded(self):
+        cache = TextCache(max_size=10)
+        cache.put(1, 'aaaa')
+        cache.put(2, 'bbbb')
+        cache.get(1)
+        cache.put(3, 'cccc')
+        self.assertEqual(('aaaa', None, 'cccc'), (cache.get(1), cache.get(2), cache.get(3)))
+        self.assertEqual(8, cache.size)
+        cache.put(4, 'd' * 11)
+        self.assertIsNone(cache.get(4))
+        cache.put(1, 'a')
+        self.assertEqual(5, cache.size)
@@ -0,0 +1,98 @@
+"""
+Local HTTP stand-in for news sites, serves canned pages for crawler tests
+"""
+
+import hashlib
+import threading
+import time
+from contextlib import contextmanager
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+
+class CannedPagesServer(ThreadingHTTPServer):
+    """
+    Serves given {path: html} pages and tracks how many requests run at once
+    """
+    daemon_threads = True
+
+    def __init__(self, pages: dict, delay: float = 0.0):
+        super().__init__(('127.0.0.1', 0), CannedPageHandler)
+        self.pages = pages
+        self.delay = delay
+        self.requested = []
+        self.connections = 0
+        self.not_modified = 0
+        self.throttled = {}
+        self.request_times = []
+        self.active = 0
+        self.max_active = 0
+        self.lock = threading.Lock()
+
+    def process_request(self, request, client_address):
+        with self.lock:
+            self.connections += 1
+        super().process_request(request, client_address)
+
+    def url(self, path: str) -> str:
+        return 'http://127.0.0.1:{}{}'.format(self.server_address[1], path)
+
+
+class CannedPageHandler(BaseHTTPRequestHandler):
+    protocol_version = 'HTTP/1.1'
+
+    def do_GET(self):
+        server = self.server
+        with server.lock:
+            server.requested.append(self.path)
+            server.request_times.append(time.monotonic())
+            throttle = server.throttled.get(self.path, 0) > 0
+            if throttle:
+                server.throttled[self.path] -= 1
+            server.active += 1
+            server.max_active = max(server.max_active, server.active)
+        try:
+            time.sleep(server.delay)
+            if throttle:
+                self.send_response(429)
+                self.send_header('Retry-After', '0')
+                self.send_header('Content-Length', '0')
+                self.end_headers()
+                return
+            page = server.pages.get(self.path)
+            if page is None:
+                self.send_error(404)
+                return
+            body = page.encode('utf-8')
+            etag = '"{}"'.format(hashlib.md5(body).hexdigest())
+            if self.headers.get('If-None-Match') == etag:
+                with server.lock:
+                    server.not_modified += 1
+                self.send_response(304)
+                self.send_header('ETag', etag)
+                self.send_header('Content-Length', '0')
+                self.end_headers()
+                return
+            self.send_response(200)
+            self.send_header('ETag', etag)
+            self.send_header('Content-Type', 'text/html; charset=utf-8')
+            self.send_header('Content-Length', str(len(body)))
+            self.end_headers()
+            self.wfile.write(body)
+        finally:
+            with server.lock:
+                server.active -= 1
+
+    def log_message(self, *args):
+        pass
+
+
+@contextmanager
+def serve(pages: dict, delay: float = 0.0):
+    server = CannedPagesServer(pages, delay)
+    thread = threading.Thread(target=server.serve_forever, daemon=True)
+    thread.start()
+    try:
+        yield server
+    finally:
+        server.shutdown()
+        server.server_close()
@@ -0,0 +1,37 @@
+import datetime
+import unittest
+import numpy as np
+from article import MetaDateError, date_from_meta, dates_from_meta
+
+
+class MetaDateTest(unittest.TestCase):
+    def test_date_is_parsed(self):
+        self.assertEqual(datetime.datetime(2021, 3, 1, 12, 30, 5), date_from_meta('2021-03-01 12:30:05'))
+
+    def test_other_formats_are_rejected(self):
+        for date_txt in ('2021-03-01', '2021-03-01T12:30:05', '2021-03-01 12:30:05.5', '2021-03-01 12:30:05+03:00',
+                         '2021-3-01 12:30:05', ' 2021-03-01 12:30:05', '２０２１-03-01 12:30:05', '', None):
+            with self.assertRaises(MetaDateError):
+                date_from_meta(date_txt)
+
+    def test_wrong_values_are_rejected(self):
+        with self.assertRaisesRegex(MetaDateError, '2021-02-30 12:30:05'):
+            date_from_meta('2021-02-30 12:30:05')
+        with self.assertRaises(ValueError):
+            date_from_meta('2021-03-01 24:00:00')
+
+    def test_dates_are_converted_at_once(self):
+        dates = dates_from_meta(iter(['2021-03-01 12:30:05', '2020-12-31 23:59:59']))
+        self.assertEqual(np.dtype('datetime64[s]'), dates.dtype)
+        self.assertEqual([datetime.datetime(2021, 3, 1, 12, 30, 5), datetime.datetime(2020, 12, 31, 23, 59, 59)],
+                         dates.tolist())
+        self.assertEqual([False, True], list(dates < np.datetime64('2021-01-01')))
+        self.assertEqual((0,), dates_from_meta([]).shape)
+
+    def test_wrong_date_is_reported(self):
+        with self.assertRaisesRegex(MetaDateError, '2021-03-01T12:30:05'):
+            dates_from_meta(['2021-03-01 12:30:05', '2021-03-01T12:30:05'])
+        with self.assertRaisesRegex(MetaDateError, '2021-13-01 12:30:05'):
+            dates_from_meta(['2021-03-01 12:30:05', '2021-13-01 12:30:05'])
+        with self.assertRaises(MetaDateError):
+            dates_from_meta(['2021-03-01 12:30:05', '2021-03-01 12:30:05 '])
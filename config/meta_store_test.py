@@ -0,0 +1,148 @@
+import datetime
+import json
+import os
+import shutil
+import tempfile
+import unittest
+from unittest import mock
+from article import Article, CachedArticle
+from meta_store import MetaStore, import_meta_files, set_meta_store_mode, uses_meta_store
+from packed_corpus import PackedCorpus, pack_dataset
+from pipeline import validate_dataset
+from pos_frequency_pipeline import POSFrequencyPipeline, count_pos_tags
+from scrapper import build_url_index
+
+
+class MetaStoreTest(unittest.TestCase):
+    def setUp(self) -> None:
+        self.folder = tempfile.mkdtemp()
+        self.addCleanup(shutil.rmtree, self.folder)
+        self.path = os.path.join(self.folder, 'state', 'meta.jsonl')
+
+    def test_records_are_merged(self):
+        with MetaStore(self.path) as store:
+            store.put({'id': 2, 'url': 'http://site/2', 'title': 'Вторая'})
+            store.put({'id': 1, 'url': 'http://site/1', 'title': 'Первая'})
+            self.assertEqual('Вторая', store.get(2)['title'])
+            store.update(2, {'title': 'Новая', 'pos_frequencies': {'S': 1}})
+            self.assertEqual({'id': 2, 'url': 'http://site/2', 'title': 'Новая', 'pos_frequencies': {'S': 1}},
+                             store.get(2))
+        store = MetaStore(self.path)
+        self.assertEqual([1, 2], store.get_ids())
+        self.assertEqual('Новая', store.get(2)['title'])
+        self.assertIsNone(store.get(3))
+
+    def test_records_are_synced_by_batches(self):
+        with mock.patch('meta_store.SYNC_BATCH_SIZE', 2), mock.patch('os.fsync') as fsync:
+            with MetaStore(self.path) as store:
+                for article_id in range(5):
+                    store.put({'id': article_id})
+                self.assertEqual(2, fsync.call_count)
+            self.assertEqual(3, fsync.call_count)
+
+    def test_incomplete_record_is_dropped(self):
+        with MetaStore(self.path) as store:
+            store.put({'id': 1, 'title': 'Первая'})
+        with open(self.path, 'ab') as file:
+            file.write('{"id": 2, "title": "Втор'.encode('utf-8'))
+
+        store = MetaStore(self.path)
+        self.assertEqual([1], store.get_ids())
+        store.put({'id': 3})
+        store.close()
+        with open(self.path, encoding='utf-8') as file:
+            self.assertEqual([1, 3], [json.loads(line)['id'] for line in file])
+
+    def test_compact_and_export(self):
+        with MetaStore(self.path) as store:
+            store.put({'id': 1, 'title': 'Первая'})
+            store.update(1, {'title': 'Новая'})
+            store.put({'id': 2, 'title': 'Вторая'})
+            store.compact()
+            self.assertEqual({'id': 1, 'title': 'Новая'}, store.get(1))
+            store.export(os.path.join(self.folder, 'articles'))
+        with open(self.path, encoding='utf-8') as file:
+            self.assertEqual(2, len(file.readlines()))
+        self.assertFalse(uses_meta_store(os.path.join(self.folder, 'articles')))
+
+        imported_path = os.path.join(self.folder, 'imported.jsonl')
+        import_meta_files(os.path.join(self.folder, 'articles'), imported_path)
+        imported = MetaStore(imported_path)
+        self.assertEqual([MetaStore(self.path).get(1), MetaStore(self.path).get(2)],
+                         [imported.get(1), imported.get(2)])
+        self.assertTrue(uses_meta_store(os.path.join(self.folder, 'articles')))
+
+
+class MetaStoreDatasetTest(unittest.TestCase):
+    def setUp(self) -> None:
+        self.folder = tempfile.mkdtemp()
+        self.addCleanup(shutil.rmtree, self.folder)
+        self.assets = os.path.join(self.folder, 'articles')
+        os.makedirs(self.assets)
+        self.path = os.path.join(self.folder, 'meta.jsonl')
+        self.store = MetaStore(self.path)
+        self.addCleanup(self.store.close)
+        patchers = [mock.patch('article.ASSETS_PATH', self.assets),
+                    mock.patch('article.META_STORE_PATH', self.path),
+                    mock.patch('pipeline.META_STORE_PATH', self.path),
+                    mock.patch('pipeline.DATASET_INDEX_PATH', os.path.join(self.folder, 'no', 'index')),
+                    mock.patch('article.open_meta_store', return_value=self.store),
+                    mock.patch('pipeline.open_meta_store', return_value=self.store),
+                    mock.patch('packed_corpus.open_meta_store', return_value=self.store),
+                    mock.patch('scrapper.open_meta_store', return_value=self.store),
+                    mock.patch.object(Article, 'meta_store', self.store)]
+        for patcher in patchers:
+            patcher.start()
+            self.addCleanup(patcher.stop)
+        set_meta_store_mode(self.assets, True)
+        for article_id in (1, 2):
+            article = Article('http://site/{}'.format(article_id), article_id)
+            article.date = datetime.datetime(2021, 3, article_id, 12, 30)
+            article.text = 'Текст'
+            article.save_raw()
+
+    def test_articles_are_read_from_store(self):
+        self.assertEqual(['.meta_store', '1_raw.txt', '2_raw.txt'], sorted(os.listdir(self.assets)))
+        validate_dataset(self.assets)
+        article = CachedArticle(2).load_meta()
+        self.assertEqual(('http://site/2', datetime.datetime(2021, 3, 2, 12, 30)), (article.url, article.date))
+        with self.assertRaises(FileNotFoundError):
+            CachedArticle(3).load_meta()
+
+        path = self.store.materialize(1, self.assets)
+        with open(path, encoding='utf-8') as file:
+            self.assertEqual('http://site/1', json.load(file)['url'])
+
+    def test_store_has_priority_over_meta_files(self):
+        self.store.materialize(1, self.assets)
+        self.store.update(1, {'title': 'Новая'})
+        self.assertEqual('Новая', CachedArticle(1).load_meta().title)
+        validate_dataset(self.assets)
+
+        set_meta_store_mode(self.assets, False)
+        self.assertEqual('', CachedArticle(1).load_meta().title)
+
+    def test_packing_does_not_write_meta_files(self):
+        self.store.update(1, {'pos_frequencies': {'S': 1}})
+        pack_path = os.path.join(self.folder, 'corpus.pack')
+        pack_dataset(self.assets, pack_path)
+        self.assertEqual(['.meta_store', '1_raw.txt', '2_raw.txt'], sorted(os.listdir(self.assets)))
+        corpus = PackedCorpus(pack_path)
+        self.addCleanup(corpus.close)
+        self.assertEqual({'S': 1}, corpus.get_meta(1)['pos_frequencies'])
+        self.assertEqual('http://site/2', corpus.get_meta(2)['url'])
+
+    def test_url_index_is_built_in_one_pass(self):
+        self.store.update(1, {'url': 'http://site/moved'})
+        with mock.patch.object(self.store, 'get') as get:
+            self.assertEqual({'http://site/moved': 1, 'http://site/2': 2}, build_url_index(self.assets))
+        get.assert_not_called()
+
+    def test_frequencies_are_appended_to_store(self):
+        pipeline = POSFrequencyPipeline(None)
+        pipeline.meta_store = self.store
+        pipeline._save_frequencies(count_pos_tags([1, 2], ['мама<S>(NOUN)', '']))
+        self.assertEqual({'S': 1}, self.store.get(1)['pos_frequencies'])
+        self.assertEqual('http://site/1', self.store.get(1)['url'])
+        self.assertEqual({}, self.store.get(2)['pos_frequencies'])
+        self.assertEqual(['.meta_store', '1_raw.txt', '2_raw.txt'], sorted(os.listdir(self.assets)))
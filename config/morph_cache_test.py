@@ -0,0 +1,88 @@
+import json
+import os
+import shutil
+import tempfile
+import unittest
+from config.mystem_batch_test import FakeMorphAnalyzer, make_pipeline, run_pipeline
+from pipeline import MorphTagsCache
+
+
+class CountingMorphAnalyzer(FakeMorphAnalyzer):
+    def __init__(self):
+        self.parsed = []
+
+    def parse(self, word):
+        self.parsed.append(word)
+        return super().parse(word)
+
+
+class MorphTagsCacheTest(unittest.TestCase):
+    def setUp(self) -> None:
+        self.state = tempfile.mkdtemp()
+
+    def tearDown(self) -> None:
+        shutil.rmtree(self.state)
+
+    def test_hits_and_misses(self):
+        analyzer = CountingMorphAnalyzer()
+        cache = MorphTagsCache(analyzer)
+        for word in ['мама', 'Мама', 'рама', 'мама']:
+            self.assertEqual(str(FakeMorphAnalyzer.parse(word)[0].tag), cache.get_tags(word))
+        self.assertEqual(['мама', 'Мама', 'рама'], analyzer.parsed)
+        self.assertEqual((1, 3), (cache.hits, cache.misses))
+
+    def test_least_recently_used_is_evicted(self):
+        analyzer = CountingMorphAnalyzer()
+        cache = MorphTagsCache(analyzer, max_size=2)
+        for word in ['мама', 'рама', 'мама', 'река', 'мама', 'рама']:
+            cache.get_tags(word)
+        self.assertEqual(['мама', 'рама', 'река', 'рама'], analyzer.parsed)
+        self.assertEqual(2, len(cache))
+
+    def test_warm_run_skips_analyzer(self):
+        path = os.path.join(self.state, 'pipeline', 'cache.json')
+        cold = MorphTagsCache(CountingMorphAnalyzer(), max_size=2)
+        for word in ['мама', 'рама', 'река', 'рама']:
+            cold.get_tags(word)
+        cold.save(path)
+
+        analyzer = CountingMorphAnalyzer()
+        warm = MorphTagsCache(analyzer, max_size=2)
+        warm.load(path)
+        self.assertEqual(cold.entries(), warm.entries())
+        warm.get_tags('река')
+        warm.get_tags('рама')
+        self.assertEqual([], analyzer.parsed)
+
+        missing = MorphTagsCache(analyzer)
+        missing.load(os.path.join(self.state, 'missing.json'))
+        self.assertEqual(0, len(missing))
+
+    def test_cache_of_other_tagger_versions_is_ignored(self):
+        path = os.path.join(self.state, 'cache.json')
+        cache = MorphTagsCache(CountingMorphAnalyzer())
+        cache.get_tags('мама')
+        cache.save(path, tagging_config={'pipeline_version': 1, 'pymorphy2': '0.8'})
+
+        same = MorphTagsCache(CountingMorphAnalyzer())
+        same.load(path, tagging_config={'pipeline_version': 1, 'pymorphy2': '0.8'})
+        self.assertEqual(1, len(same))
+        upgraded = MorphTagsCache(CountingMorphAnalyzer())
+        upgraded.load(path, tagging_config={'pipeline_version': 1, 'pymorphy2': '0.9'})
+        self.assertEqual(0, len(upgraded))
+
+        # files of the previous format have no versions at all
+        with open(path, 'w', encoding='utf-8') as file:
+            json.dump([['мама', 'NOUN']], file)
+        unversioned = MorphTagsCache(CountingMorphAnalyzer())
+        unversioned.load(path)
+        self.assertEqual(0, len(unversioned))
+
+    def test_pipeline_parses_each_word_once(self):
+        assets, pipeline = make_pipeline(['Мама мыла раму, мама.', 'Мыла мама'], batch_size=1)
+        self.addCleanup(shutil.rmtree, assets)
+        analyzer = CountingMorphAnalyzer()
+        pipeline.morph_cache = MorphTagsCache(analyzer)
+        processed = run_pipeline(assets, pipeline)
+        self.assertEqual(['Мама', 'мыла', 'раму', 'мама', 'Мыла'], analyzer.parsed)
+        self.assertEqual('мыла<S>(NOUN,4) мама<S>(NOUN,4)', processed[2])
@@ -0,0 +1,44 @@
+"""
+Compares per-article and batched mystem analysis on collected raw texts.
+Nothing is saved, only tokens are built.
+Run from the project root: python -m config.mystem_batch_benchmark
+"""
+
+import argparse
+import time
+from constants import ASSETS_PATH
+from pipeline import CorpusManager, TextProcessingPipeline
+
+
+def benchmark(pipeline: TextProcessingPipeline, texts: list) -> float:
+    start = time.perf_counter()
+    tokens_number = 0
+    for batch_start in range(0, len(texts), pipeline.batch_size):
+        batch = texts[batch_start:batch_start + pipeline.batch_size]
+        tokens_number += sum(len(tokens) for tokens in pipeline._process_batch(batch))
+    return tokens_number / (time.perf_counter() - start)
+
+
+def main():
+    arg_parser = argparse.ArgumentParser(description='Compares mystem batch sizes on raw articles')
+    arg_parser.add_argument('--assets-dir', type=str, default=ASSETS_PATH,
+                            help='folder with N_raw.txt files')
+    arg_parser.add_argument('--batch-sizes', type=int, nargs='+', default=[1, 10, 50, 200])
+    args = arg_parser.parse_args()
+
+    corpus_manager = CorpusManager(path_to_raw_txt_data=args.assets_dir)
+    texts = [article.get_raw_text() for _, article in sorted(corpus_manager.get_articles().items())]
+    if not texts:
+        print('No raw texts found in {}'.format(args.assets_dir))
+        return
+    pipeline = TextProcessingPipeline(corpus_manager)
+    # warm up the mystem subprocess and pymorphy2 dictionaries
+    pipeline._process_batch(texts[:1])
+    print('Analyzing {} articles'.format(len(texts)))
+    for batch_size in args.batch_sizes:
+        pipeline.batch_size = batch_size
+        print('batch {:<6} {:>10.1f} tokens/sec'.format(batch_size, benchmark(pipeline, texts)))
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,93 @@
+import os
+import re
+import shutil
+import tempfile
+import unittest
+from collections import namedtuple
+from unittest import mock
+from pipeline import BATCH_SENTINEL, CorpusManager, TextProcessingPipeline, split_batch_analysis
+
+
+Parse = namedtuple('Parse', ['tag'])
+
+
+class FakeMystem:
+    """
+    Splits text into words and gaps the way mystem -c does, analyzes cyrillic words only
+    """
+    def __init__(self):
+        self.calls = 0
+
+    def analyze(self, text):
+        self.calls += 1
+        result = []
+        for chunk in re.findall(r'\w+|\W+', text):
+            if re.fullmatch(r'[а-яё]+', chunk, re.IGNORECASE):
+                result.append({'analysis': [{'lex': chunk.lower(), 'gr': 'S'}], 'text': chunk})
+            elif chunk.isalnum():
+                result.append({'analysis': [], 'text': chunk})
+            else:
+                result.append({'text': chunk})
+        result.append({'text': '\n'})
+        return result
+
+
+class FakeMorphAnalyzer:
+    @staticmethod
+    def parse(word):
+        return [Parse('NOUN,{}'.format(len(word)))]
+
+
+def make_pipeline(texts, batch_size):
+    assets = tempfile.mkdtemp()
+    for article_id, text in enumerate(texts, start=1):
+        with open(os.path.join(assets, '{}_raw.txt'.format(article_id)), 'w', encoding='utf-8') as file:
+            file.write(text)
+    with mock.patch('pipeline.Mystem', FakeMystem), mock.patch('pipeline.MorphAnalyzer', FakeMorphAnalyzer):
+        pipeline = TextProcessingPipeline(CorpusManager(assets), batch_size=batch_size)
+    return assets, pipeline
+
+
+def run_pipeline(assets, pipeline):
+    with mock.patch('article.ASSETS_PATH', assets):
+        pipeline.run()
+        processed = {}
+        for article_id, article in pipeline.corpus_manager.get_articles().items():
+            with open(article._get_processed_text_path(), encoding='utf-8') as file:
+                processed[article_id] = file.read()
+    return processed
+
+
+class MystemBatchTest(unittest.TestCase):
+    def setUp(self) -> None:
+        self.texts = ['Мама мыла раму.', 'Hello, мир 2021!', '', 'Во второй реке.\nНовая строка']
+        self.assets = []
+
+    def tearDown(self) -> None:
+        for assets in self.assets:
+            shutil.rmtree(assets)
+
+    def _run(self, texts, batch_size):
+        assets, pipeline = make_pipeline(texts, batch_size)
+        self.assets.append(assets)
+        return run_pipeline(assets, pipeline), pipeline._mystem.calls
+
+    def test_batch_output_equals_per_article(self):
+        single, single_calls = self._run(self.texts, 1)
+        batched, batched_calls = self._run(self.texts, 3)
+        self.assertEqual(single, batched)
+        self.assertEqual(len(self.texts), single_calls)
+        self.assertEqual(2, batched_calls)
+        self.assertEqual('мама<S>(NOUN,4) мыла<S>(NOUN,4) раму<S>(NOUN,4)', single[1])
+
+    def test_sentinel_in_text_falls_back(self):
+        texts = ['Мама {}'.format(BATCH_SENTINEL.upper()), 'раму']
+        single, _ = self._run(texts, 1)
+        batched, batched_calls = self._run(texts, 2)
+        self.assertEqual(single, batched)
+        self.assertEqual(2, batched_calls)
+
+    def test_split_rejects_unexpected_parts(self):
+        analysis = [{'text': 'a'}, {'text': BATCH_SENTINEL}, {'text': 'b'}]
+        self.assertEqual([[{'text': 'a'}], [{'text': 'b'}]], split_batch_analysis(analysis, 2))
+        self.assertIsNone(split_batch_analysis(analysis, 3))
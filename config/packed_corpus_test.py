@@ -0,0 +1,75 @@
+import json
+import multiprocessing
+import os
+import pickle
+import shutil
+import tempfile
+import unittest
+from unittest import mock
+from config.mystem_batch_test import FakeMorphAnalyzer, FakeMystem, make_pipeline, run_pipeline
+from packed_corpus import PackFormatError, PackedCorpus, PackedCorpusManager, pack_dataset, unpack_dataset
+
+
+class PackedCorpusTest(unittest.TestCase):
+    def setUp(self) -> None:
+        self.texts = ['Мама мыла раму', 'Вторая река\nи строка', '']
+        self.assets, self.pipeline = make_pipeline(self.texts, batch_size=1)
+        for article_id in range(1, len(self.texts) + 1):
+            with open(os.path.join(self.assets, '{}_meta.json'.format(article_id)), 'w', encoding='utf-8') as file:
+                json.dump({'id': article_id, 'title': 'Статья'}, file, ensure_ascii=False)
+        self.state = tempfile.mkdtemp()
+        self.pack_path = os.path.join(self.state, 'corpus.pack')
+        pack_dataset(self.assets, self.pack_path)
+
+    def tearDown(self) -> None:
+        shutil.rmtree(self.assets)
+        shutil.rmtree(self.state)
+
+    def test_random_access(self):
+        corpus = PackedCorpus(self.pack_path)
+        self.assertEqual([1, 2, 3], corpus.get_ids())
+        self.assertEqual(self.texts[1], corpus.get_raw_text(2))
+        self.assertEqual(len(self.texts[0].encode('utf-8')), corpus.get_raw_text_size(1))
+        self.assertEqual('', corpus.get_raw_text(3))
+        self.assertEqual({'id': 2, 'title': 'Статья'}, corpus.get_meta(2))
+        corpus.close()
+
+    def test_unpack_restores_files(self):
+        restored = os.path.join(self.state, 'restored')
+        unpack_dataset(self.pack_path, restored)
+        self.assertEqual(sorted(os.listdir(self.assets)), sorted(os.listdir(restored)))
+        for file_name in os.listdir(restored):
+            with open(os.path.join(self.assets, file_name), 'rb') as original, \
+                    open(os.path.join(restored, file_name), 'rb') as file:
+                self.assertEqual(original.read(), file.read())
+
+    def test_pipeline_reads_packed_corpus(self):
+        expected = run_pipeline(self.assets, self.pipeline)
+        for file_name in os.listdir(self.assets):
+            if file_name.endswith('_processed.txt'):
+                os.remove(os.path.join(self.assets, file_name))
+
+        self.pipeline.corpus_manager = PackedCorpusManager(self.pack_path)
+        article = pickle.loads(pickle.dumps(self.pipeline.corpus_manager.get_articles()[2]))
+        self.assertEqual(self.texts[1], article.get_raw_text())
+        self.assertEqual(expected, run_pipeline(self.assets, self.pipeline))
+
+    @unittest.skipUnless(multiprocessing.get_start_method() == 'fork', 'workers inherit fake analyzers only on fork')
+    def test_workers_read_packed_corpus(self):
+        expected = run_pipeline(self.assets, self.pipeline)
+        self.pipeline.corpus_manager = PackedCorpusManager(self.pack_path)
+        self.pipeline.workers = 2
+        with mock.patch('pipeline.Mystem', FakeMystem), mock.patch('pipeline.MorphAnalyzer', FakeMorphAnalyzer):
+            self.assertEqual(expected, run_pipeline(self.assets, self.pipeline))
+
+    def test_broken_pack_is_rejected(self):
+        with open(self.pack_path, 'rb') as file:
+            content = file.read()
+        with open(self.pack_path, 'wb') as file:
+            file.write(content[:-1])
+        with self.assertRaises(PackFormatError):
+            PackedCorpus(self.pack_path)
+        with open(self.pack_path, 'wb') as file:
+            file.write(b'not a pack')
+        with self.assertRaises(PackFormatError):
+            PackedCorpus(self.pack_path)
@@ -0,0 +1,57 @@
+import multiprocessing
+import shutil
+import unittest
+from concurrent.futures import Future
+from unittest import mock
+from config.mystem_batch_test import FakeMorphAnalyzer, FakeMystem, make_pipeline, run_pipeline
+
+
+@unittest.skipUnless(multiprocessing.get_start_method() == 'fork', 'workers inherit fake analyzers only on fork')
+class ParallelPipelineTest(unittest.TestCase):
+    def setUp(self) -> None:
+        self.texts = ['Статья номер {} про реку и раму, id {}.'.format('один' * (i % 3 + 1), i) for i in range(20)]
+        self.assets = []
+
+    def tearDown(self) -> None:
+        for assets in self.assets:
+            shutil.rmtree(assets)
+
+    def _run(self, batch_size, workers):
+        assets, pipeline = make_pipeline(self.texts, batch_size)
+        self.assets.append(assets)
+        pipeline.workers = workers
+        with mock.patch('pipeline.Mystem', FakeMystem), mock.patch('pipeline.MorphAnalyzer', FakeMorphAnalyzer):
+            return run_pipeline(assets, pipeline)
+
+    def test_parallel_output_equals_serial(self):
+        serial = self._run(batch_size=1, workers=1)
+        self.assertEqual(len(self.texts), len(serial))
+        self.assertEqual(serial, self._run(batch_size=1, workers=3))
+        self.assertEqual(serial, self._run(batch_size=4, workers=2))
+
+
+class SubmittingExecutor:
+    def __init__(self):
+        self.submitted = []
+
+    def submit(self, function, chunk):
+        future = Future()
+        future.set_result([str(article) for article in chunk])
+        self.submitted.append(chunk)
+        return future
+
+
+class ResultsWindowTest(unittest.TestCase):
+    def test_few_chunks_are_submitted_at_a_time(self):
+        assets, pipeline = make_pipeline([], batch_size=1)
+        self.addCleanup(shutil.rmtree, assets)
+        pipeline.workers = 2
+        executor = SubmittingExecutor()
+        chunks = [[article_id] for article_id in range(20)]
+        in_flight = []
+        results = []
+        for result in pipeline._iter_results_in_window(executor, chunks):
+            in_flight.append(len(executor.submitted) - len(results))
+            results.append(result)
+        self.assertEqual([[str(article_id)] for article_id in range(20)], results)
+        self.assertEqual(4, max(in_flight))
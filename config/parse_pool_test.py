@@ -0,0 +1,73 @@
+import datetime
+import json
+import os
+import shutil
+import tempfile
+import unittest
+from unittest import mock
+from config.async_fetch_test import ARTICLE_PAGE
+from config.local_server import serve
+from scrapper import ArticleParser, AsyncFetcher, FetchedPage, parse_articles_in_processes, parse_page_fields
+
+
+class DatedArticleParser(ArticleParser):
+    def _fill_article_with_text(self, article_soup):
+        self.article.text = article_soup.find('p').text
+
+    def _fill_article_with_meta_information(self, article_soup):
+        self.article.title = article_soup.find('h1').text
+        self.article.date = datetime.datetime(2021, 1, 26, 7, 30)
+
+
+class FailingArticleParser(DatedArticleParser):
+    def _fill_article_with_text(self, article_soup):
+        if self.full_url.endswith('/article/1'):
+            raise AttributeError('no text')
+        super()._fill_article_with_text(article_soup)
+
+
+class ParsePoolTest(unittest.TestCase):
+    def setUp(self) -> None:
+        self.assets = tempfile.mkdtemp()
+
+    def tearDown(self) -> None:
+        shutil.rmtree(self.assets)
+
+    def test_parse_page_fields(self):
+        page = FetchedPage('http://site/1', ARTICLE_PAGE.format(1), False)
+        fields = parse_page_fields(page, parser_class=DatedArticleParser)
+        self.assertEqual('Article 1', fields['title'])
+        self.assertEqual('Text', fields['text'])
+        self.assertEqual('2021-01-26T07:30:00', fields['date'])
+
+    def test_articles_are_saved_with_sequential_ids(self):
+        pages = {'/article/{}'.format(i): ARTICLE_PAGE.format(i) for i in range(12)}
+        with serve(pages) as server, mock.patch('article.ASSETS_PATH', self.assets):
+            urls = [server.url(path) for path in pages]
+            saved = parse_articles_in_processes(urls, AsyncFetcher(), first_id=3, workers=2,
+                                                parser_class=DatedArticleParser)
+
+        self.assertEqual(list(range(3, 15)), sorted(article.article_id for article in saved))
+        for article in saved:
+            with open(os.path.join(self.assets, '{}_meta.json'.format(article.article_id)),
+                      encoding='utf-8') as f:
+                meta = json.load(f)
+            self.assertEqual('Article ' + meta['url'].rsplit('/', 1)[1], meta['title'])
+            self.assertEqual('2021-01-26 07:30:00', meta['date'])
+
+    def test_failed_page_is_skipped(self):
+        pages = {'/article/{}'.format(i): ARTICLE_PAGE.format(i) for i in range(6)}
+        with serve(pages) as server, mock.patch('article.ASSETS_PATH', self.assets), \
+                self.assertLogs('scrapper', 'ERROR') as logs:
+            urls = [server.url(path) for path in pages]
+            saved = parse_articles_in_processes(urls, AsyncFetcher(), first_id=1, workers=2,
+                                                parser_class=FailingArticleParser)
+
+        self.assertEqual([1, 2, 3, 4, 5], sorted(article.article_id for article in saved))
+        self.assertNotIn(server.url('/article/1'), [article.url for article in saved])
+        self.assertEqual(1, len(logs.records))
+        self.assertIn('/article/1', logs.output[0])
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,105 @@
+import json
+import os
+import shutil
+import tempfile
+import unittest
+from unittest import mock
+from config.mystem_batch_test import FakeMorphAnalyzer, FakeMystem, make_pipeline, run_pipeline
+from pipeline import CorpusManager, TextProcessingPipeline
+from pos_frequency_pipeline import POSFrequencyObserver, POSFrequencyPipeline, count_pos_tags
+
+
+PROCESSED_TEXT = 'красивый<A=им,ед,полн,жен>(ADJF) мама<S,жен,од=им,ед>(NOUN) рама<S,жен,неод=вин,ед>(NOUN)'
+
+
+class POSFrequenciesTest(unittest.TestCase):
+    def setUp(self) -> None:
+        texts = [PROCESSED_TEXT, '', 'быстро<ADV=>(ADVB) ой<INTJ=>(INTJ) ого<XYZ=>(INTJ) ого<XYZ=>(INTJ)']
+        self.frequencies = count_pos_tags([1, 5, 7], iter(texts))
+
+    def test_article_frequencies(self):
+        self.assertEqual({'A': 1, 'S': 2}, self.frequencies.get_frequencies(1))
+        self.assertEqual({}, self.frequencies.get_frequencies(5))
+        self.assertEqual({'ADV': 1, 'INTJ': 1, 'XYZ': 2}, self.frequencies.get_frequencies(7))
+        self.assertEqual([(1, {'A': 1, 'S': 2}), (5, {}), (7, {'ADV': 1, 'INTJ': 1, 'XYZ': 2})],
+                         list(self.frequencies.iter_frequencies()))
+
+    def test_corpus_statistics(self):
+        self.assertEqual({'A': 1, 'ADV': 1, 'INTJ': 1, 'S': 2, 'XYZ': 2}, self.frequencies.get_totals())
+        self.assertAlmostEqual(2 / 7, self.frequencies.get_corpus_distribution()['S'])
+        distributions = self.frequencies.get_distributions()
+        self.assertEqual((3, len(self.frequencies.tags)), distributions.shape)
+        self.assertEqual([1, 0, 1], [round(row_sum, 6) for row_sum in distributions.sum(axis=1)])
+        self.assertAlmostEqual(0.5, distributions[2, self.frequencies.tags.index('XYZ')])
+
+    def test_many_new_tags(self):
+        tags = ['T' + chr(ord('A') + tag // 26) + chr(ord('A') + tag % 26) for tag in range(40)]
+        texts = [' слово<{}=>(X)'.format(tag) * (count + 1) for count, tag in enumerate(tags)]
+        frequencies = count_pos_tags(list(range(40)), iter(texts))
+        for article_id in (0, 17, 39):
+            self.assertEqual({tags[article_id]: article_id + 1}, frequencies.get_frequencies(article_id))
+        self.assertEqual(sum(range(41)), frequencies.counts.sum())
+
+
+class POSFrequencyPipelineTest(unittest.TestCase):
+    def setUp(self) -> None:
+        self.assets = tempfile.mkdtemp()
+        for article_id in (1, 2):
+            for kind in ('raw.txt', 'meta.json'):
+                with open(os.path.join(self.assets, '{}_{}'.format(article_id, kind)), 'w', encoding='utf-8') as file:
+                    json.dump({'id': article_id}, file)
+        with open(os.path.join(self.assets, '1_processed.txt'), 'w', encoding='utf-8') as file:
+            file.write(PROCESSED_TEXT)
+        patchers = [mock.patch('article.ASSETS_PATH', self.assets),
+                    mock.patch('pipeline.DATASET_INDEX_PATH', os.path.join(self.assets, 'index', 'index.json'))]
+        for patcher in patchers:
+            patcher.start()
+            self.addCleanup(patcher.stop)
+
+    def tearDown(self) -> None:
+        shutil.rmtree(self.assets)
+
+    def test_frequencies_are_saved_for_processed_articles(self):
+        POSFrequencyPipeline(CorpusManager(self.assets)).run()
+        with open(os.path.join(self.assets, '1_meta.json'), encoding='utf-8') as file:
+            self.assertEqual({'id': 1, 'pos_frequencies': {'A': 1, 'S': 2}}, json.load(file))
+        self.assertTrue(os.path.exists(os.path.join(self.assets, '1_image.png')))
+        with open(os.path.join(self.assets, '2_meta.json'), encoding='utf-8') as file:
+            self.assertEqual({'id': 2}, json.load(file))
+
+    def test_pipelines_share_corpus_manager(self):
+        os.remove(os.path.join(self.assets, '1_processed.txt'))
+        for article_id in (1, 2):
+            with open(os.path.join(self.assets, '{}_raw.txt'.format(article_id)), 'w', encoding='utf-8') as file:
+                file.write('Мама мыла раму')
+        corpus_manager = CorpusManager(self.assets)
+        with mock.patch('pipeline.Mystem', FakeMystem), mock.patch('pipeline.MorphAnalyzer', FakeMorphAnalyzer):
+            TextProcessingPipeline(corpus_manager).run()
+        POSFrequencyPipeline(corpus_manager).run()
+        for article_id in (1, 2):
+            with open(os.path.join(self.assets, '{}_meta.json'.format(article_id)), encoding='utf-8') as file:
+                self.assertTrue(json.load(file)['pos_frequencies'])
+            self.assertTrue(os.path.exists(os.path.join(self.assets, '{}_image.png'.format(article_id))))
+
+
+class POSFrequencyObserverTest(unittest.TestCase):
+    def setUp(self) -> None:
+        texts = ['Мама мыла раму.\n' * 40, 'Hello, мир 2021!', '', 'Во второй реке']
+        self.assets, self.pipeline = make_pipeline(texts, batch_size=2)
+        self.addCleanup(shutil.rmtree, self.assets)
+        self.observer = POSFrequencyObserver()
+        self.pipeline.observers.append(self.observer)
+
+    def test_counts_equal_counts_of_processed_texts(self):
+        with mock.patch('pipeline.STREAM_MIN_SIZE', 100), mock.patch('pipeline.STREAM_CHUNK_SIZE', 64):
+            processed = run_pipeline(self.assets, self.pipeline)
+        expected = count_pos_tags(sorted(processed), (processed[article_id] for article_id in sorted(processed)))
+        observed = self.observer.get_pos_frequencies()
+        self.assertEqual([1, 2, 3, 4], observed.article_ids)
+        self.assertEqual(list(expected.iter_frequencies()), list(observed.iter_frequencies()))
+        self.assertEqual({'S': 120}, observed.get_frequencies(1))
+
+    def test_observers_need_single_worker(self):
+        self.pipeline.workers = 2
+        with self.assertRaises(ValueError):
+            run_pipeline(self.assets, self.pipeline)
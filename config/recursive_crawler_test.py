@@ -0,0 +1,132 @@
+import json
+import os
+import re
+import shutil
+import tempfile
+import unittest
+from config.local_server import serve
+from scrapper import BloomFilter, CrawlerRecursive, UnknownConfigError, UrlFrontier, normalize_url, validate_config
+
+
+def make_website(num_pages):
+    # every page links to the next two pages, an external site and itself with a fragment
+    pages = {}
+    for i in range(num_pages):
+        links = ''.join('<a href="/page/{}">next</a>'.format(j) for j in (i + 1, i + 2) if j < num_pages)
+        links += '<a href="http://example.com/">external</a><a href="/page/{}#top">self</a>'.format(i)
+        pages['/page/{}'.format(i)] = '<html><body>{}</body></html>'.format(links)
+    return pages
+
+
+class WebsiteCrawler(CrawlerRecursive):
+    # the test website has article pages only
+    def _is_article_url(self, url):
+        return '/page/' in url
+
+
+class UrlStructuresTest(unittest.TestCase):
+    def setUp(self) -> None:
+        self.state_dir = tempfile.mkdtemp()
+        self.addCleanup(shutil.rmtree, self.state_dir)
+
+    def test_normalize_url(self):
+        self.assertEqual('http://site.ru/news?a=1&b=2',
+                         normalize_url('HTTP://Site.RU:80/news?b=2&a=1#comments'))
+        self.assertEqual('https://site.ru/', normalize_url('https://site.ru'))
+        self.assertEqual('https://site.ru:8443/', normalize_url('https://site.ru:8443/'))
+
+    def test_bloom_filter(self):
+        seen = BloomFilter(capacity=1000, error_rate=0.01)
+        for i in range(1000):
+            seen.add('http://site.ru/{}'.format(i))
+        self.assertTrue(all('http://site.ru/{}'.format(i) in seen for i in range(1000)))
+        false_positives = sum('http://other.ru/{}'.format(i) in seen for i in range(1000))
+        self.assertLess(false_positives, 50)
+
+    def test_frontier_keeps_fifo_order_when_spilled(self):
+        frontier = UrlFrontier(os.path.join(self.state_dir, 'frontier.tsv'), max_in_memory=3)
+        popped = []
+        for i in range(10):
+            frontier.push(i, 'url{}'.format(i))
+            if i % 4 == 0:
+                popped.append(frontier.pop())
+        while frontier:
+            popped.append(frontier.pop())
+        self.assertEqual([(i, 'url{}'.format(i)) for i in range(10)], popped)
+        self.assertLessEqual(len(frontier._head), 3)
+
+
+class CrawlerRecursiveTest(unittest.TestCase):
+    def setUp(self) -> None:
+        self.state_dir = tempfile.mkdtemp()
+        self.addCleanup(shutil.rmtree, self.state_dir)
+        self.frontier_path = os.path.join(self.state_dir, 'frontier.tsv')
+
+    def test_article_pages_are_told_by_subclasses(self):
+        pages = make_website(3)
+        pages['/section'] = '<html><body><a href="/page/1">article</a></body></html>'
+        pages['/page/0'] = pages['/page/0'].replace('<body>', '<body><a href="/section">section</a>')
+        with serve(pages) as server:
+            crawler = WebsiteCrawler([server.url('/page/0')], max_articles=100, frontier_path=self.frontier_path)
+            crawler.find_articles()
+            self.assertEqual(sorted(pages), sorted(server.requested))
+            self.assertEqual([server.url('/page/1'), server.url('/page/2')], sorted(crawler.urls))
+
+            crawler = CrawlerRecursive([server.url('/page/0')], max_articles=100, frontier_path=self.frontier_path)
+            crawler.article_url_pattern = re.compile(r'^/page/[12]$')
+            crawler.find_articles()
+            self.assertEqual([server.url('/page/1'), server.url('/page/2')], sorted(crawler.urls))
+
+    def test_default_article_url_pattern(self):
+        crawler = CrawlerRecursive([], max_articles=100, frontier_path=self.frontier_path)
+        for url in ('https://www.nn.ru/text/realty/2021/01/26/69724161/', 'https://site.ru/news/123456.html',
+                    'https://site.ru/2021/1/5/title'):
+            self.assertTrue(crawler._is_article_url(url), url)
+        for url in ('https://site.ru/', 'https://site.ru/text/?page=2', 'https://site.ru/tags/2021/'):
+            self.assertFalse(crawler._is_article_url(url), url)
+
+    def test_article_url_pattern_is_validated(self):
+        path = os.path.join(self.state_dir, 'crawler_config.json')
+        for pattern, error in (('/news/\\d+', None), ('/news/(', UnknownConfigError), (1, UnknownConfigError)):
+            with open(path, 'w', encoding='utf-8') as file:
+                json.dump({'base_urls': ['https://site.ru/'], 'total_articles_to_find_and_parse': 10,
+                           'article_url_pattern': pattern}, file)
+            if error is None:
+                self.assertEqual((['https://site.ru/'], 10, 10), validate_config(path))
+            else:
+                self.assertRaises(error, validate_config, path)
+
+    def test_visits_whole_website_once(self):
+        pages = make_website(20)
+        with serve(pages) as server:
+            crawler = WebsiteCrawler([server.url('/page/0')], max_articles=100, frontier_path=self.frontier_path)
+            crawler.find_articles()
+            self.assertEqual(sorted(pages), sorted(server.requested))
+        self.assertEqual(19, len(crawler.urls))
+
+    def test_malformed_links_are_skipped(self):
+        pages = make_website(3)
+        pages['/page/0'] = pages['/page/0'].replace(
+            '<body>', '<body><a href="http://site.ru:abc/">a</a><a href="http://site.ru:99999/">b</a>'
+                      '<a href="http://[::1/x">c</a>')
+        with serve(pages) as server:
+            crawler = WebsiteCrawler([server.url('/page/0')], max_articles=100, frontier_path=self.frontier_path)
+            crawler.find_articles()
+            self.assertEqual(sorted(pages), sorted(server.requested))
+
+    def test_budgets(self):
+        pages = make_website(20)
+        with serve(pages) as server:
+            crawler = WebsiteCrawler([server.url('/page/0')], max_articles=100, frontier_path=self.frontier_path)
+            crawler.max_depth = 2
+            crawler.find_articles()
+            self.assertEqual(['/page/{}'.format(i) for i in range(5)], sorted(server.requested))
+
+            crawler = WebsiteCrawler([server.url('/page/0')], max_articles=100, frontier_path=self.frontier_path)
+            crawler.max_pages = 3
+            crawler.find_articles()
+            self.assertEqual(3, crawler.visited_pages)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,75 @@
+import os
+import shutil
+import tempfile
+import time
+import unittest
+from config.async_fetch_test import ARTICLE_PAGE
+from config.local_server import serve
+from scrapper import ArticleParser, AsyncFetcher, ResponseCache
+
+
+class CountingArticleParser(ArticleParser):
+    calls = 0
+
+    def _fill_article_with_text(self, article_soup):
+        CountingArticleParser.calls += 1
+        self.article.text = article_soup.find('p').text
+
+
+class ResponseCacheTest(unittest.TestCase):
+    def setUp(self) -> None:
+        self.cache_dir = tempfile.mkdtemp()
+        self.cache = ResponseCache(self.cache_dir)
+        CountingArticleParser.calls = 0
+
+    def tearDown(self) -> None:
+        shutil.rmtree(self.cache_dir)
+
+    def test_recrawl_sends_conditional_requests(self):
+        pages = {'/article/{}'.format(i): ARTICLE_PAGE.format(i) for i in range(5)}
+        with serve(pages) as server:
+            urls = [server.url(path) for path in pages]
+            fetcher = AsyncFetcher(cache=self.cache)
+            first, second = [], []
+            fetcher.download(urls, first.append)
+            fetcher.download(urls, second.append)
+            self.assertEqual(len(urls), server.not_modified)
+        self.assertFalse(any(page.not_modified for page in first))
+        self.assertTrue(all(page.not_modified for page in second))
+        self.assertEqual({page.url: page.text for page in first},
+                         {page.url: page.text for page in second})
+
+    def test_not_modified_article_is_not_parsed_again(self):
+        with serve({'/article': ARTICLE_PAGE.format(1)}) as server:
+            first = CountingArticleParser(server.url('/article'), 1, self.cache).parse()
+            second = CountingArticleParser(server.url('/article'), 2, self.cache).parse()
+        self.assertEqual(1, CountingArticleParser.calls)
+        self.assertEqual(first.text, second.text)
+        self.assertEqual(2, second.article_id)
+
+    def test_eviction_by_age_and_size(self):
+        with serve({'/a': 'a' * 1000, '/b': 'b' * 1000, '/c': 'c' * 1000}) as server:
+            fetcher = AsyncFetcher(cache=self.cache)
+            for path in ('/a', '/b', '/c'):
+                fetcher.download([server.url(path)], lambda page: None)
+                time.sleep(0.01)
+            self.cache.max_size = 2500
+            self.cache.evict()
+            self.assertIsNone(self.cache.get(server.url('/a')))
+            self.assertIsNotNone(self.cache.get(server.url('/c')))
+
+            # revalidated entry is fresh again and is not the first one to be evicted
+            os.utime(self.cache._entry_path(server.url('/b')), (0, time.time() - 100))
+            fetcher.download([server.url('/b')], lambda page: None)
+            self.cache.max_size = 1500
+            self.cache.evict()
+            self.assertIsNotNone(self.cache.get(server.url('/b')))
+            self.assertIsNone(self.cache.get(server.url('/c')))
+
+            self.cache.max_age = 0
+            self.cache.evict()
+            self.assertEqual([], os.listdir(self.cache_dir))
+
+
+if __name__ == "__main__":
+    unittest.main()
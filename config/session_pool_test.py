@@ -0,0 +1,25 @@
+import unittest
+from config.async_fetch_test import fetch_all
+from config.local_server import serve
+from scrapper import AsyncFetcher, get_session
+
+
+class SessionPoolTest(unittest.TestCase):
+    def test_session_is_shared(self):
+        self.assertIs(get_session(), get_session())
+
+    def test_connections_are_reused(self):
+        pages = {'/article/{}'.format(i): 'text {}'.format(i) for i in range(10)}
+        with serve(pages) as server:
+            urls = [server.url(path) for path in pages]
+            fetcher = AsyncFetcher(max_concurrency=2, max_per_host=2, session=get_session(pool_size=2))
+            fetched = fetch_all(fetcher, urls)
+            self.assertEqual(len(urls), len(fetched))
+            self.assertLessEqual(server.connections, 2)
+
+    def test_compression_is_negotiated(self):
+        self.assertIn('gzip', get_session().headers['Accept-Encoding'])
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,54 @@
+import asyncio
+import shutil
+import tempfile
+import time
+import unittest
+from unittest import mock
+from config.async_fetch_test import make_site
+from config.local_server import serve
+from config.parse_pool_test import DatedArticleParser
+from scrapper import AsyncFetcher, Crawler, parse_articles_in_processes
+
+
+class StreamingCrawlTest(unittest.TestCase):
+    def test_first_url_comes_before_all_seeds_are_downloaded(self):
+        pages = make_site(num_seeds=4, articles_per_seed=5)
+        with serve(pages, delay=0.2) as server:
+            seeds = [server.url('/seed/{}'.format(seed)) for seed in range(4)]
+            crawler = Crawler(seeds, max_articles=3, fetcher=AsyncFetcher(max_concurrency=1))
+
+            async def first_url():
+                start = time.monotonic()
+                async for url in crawler.iter_articles():
+                    return url, time.monotonic() - start
+                return None
+
+            url, elapsed = asyncio.run(first_url())
+            self.assertIn('/article/', url)
+            self.assertLess(elapsed, 0.6)
+
+    def test_stops_early_when_enough_articles_are_found(self):
+        pages = make_site(num_seeds=6, articles_per_seed=5)
+        with serve(pages, delay=0.1) as server:
+            seeds = [server.url('/seed/{}'.format(seed)) for seed in range(6)]
+            crawler = Crawler(seeds, max_articles=4, fetcher=AsyncFetcher(max_concurrency=1))
+            crawler.find_articles()
+            self.assertEqual(4, len(crawler.urls))
+            self.assertLess(len(server.requested), 6)
+
+    def test_articles_are_parsed_while_crawling(self):
+        assets = tempfile.mkdtemp()
+        pages = make_site(num_seeds=3, articles_per_seed=4)
+        with serve(pages) as server, mock.patch('article.ASSETS_PATH', assets):
+            seeds = [server.url('/seed/{}'.format(seed)) for seed in range(3)]
+            fetcher = AsyncFetcher()
+            crawler = Crawler(seeds, max_articles=10, fetcher=fetcher)
+            saved = parse_articles_in_processes(crawler.iter_articles(), fetcher, workers=2,
+                                                parser_class=DatedArticleParser)
+        shutil.rmtree(assets)
+        self.assertEqual(sorted(crawler.urls), sorted(article.url for article in saved))
+        self.assertEqual(list(range(1, 11)), sorted(article.article_id for article in saved))
+
+
+if __name__ == "__main__":
+    unittest.main()
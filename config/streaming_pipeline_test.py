@@ -0,0 +1,31 @@
+import io
+import shutil
+import unittest
+from unittest import mock
+from config.mystem_batch_test import make_pipeline, run_pipeline
+from pipeline import iter_text_chunks
+
+
+class StreamingPipelineTest(unittest.TestCase):
+    def setUp(self) -> None:
+        self.texts = ['Мама мыла раму.\n' * 40 + 'Длинная строка без переносов ' * 20,
+                      'Короткая статья', 'Вторая короткая статья']
+
+    def _run(self, batch_size):
+        assets, pipeline = make_pipeline(self.texts, batch_size)
+        self.addCleanup(shutil.rmtree, assets)
+        return run_pipeline(assets, pipeline), pipeline._mystem.calls
+
+    def test_text_chunks_keep_words(self):
+        text = 'раз два\nтри четыре пять\nшесть'
+        chunks = list(iter_text_chunks(io.StringIO(text), chunk_size=5))
+        self.assertEqual(text, ''.join(chunks))
+        self.assertEqual(['раз ', 'два\n', 'три ', 'четыре ', 'пять\n', 'шесть'], chunks)
+
+    def test_streamed_output_equals_whole_text(self):
+        expected, whole_calls = self._run(batch_size=2)
+        self.assertEqual(2, whole_calls)
+        with mock.patch('pipeline.STREAM_MIN_SIZE', 100), mock.patch('pipeline.STREAM_CHUNK_SIZE', 64):
+            streamed, streamed_calls = self._run(batch_size=2)
+        self.assertEqual(expected, streamed)
+        self.assertGreater(streamed_calls, 20)
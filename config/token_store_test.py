@@ -0,0 +1,35 @@
+import pickle
+import unittest
+from pipeline import MorphologicalToken, TokenStore
+
+
+class TokenStoreTest(unittest.TestCase):
+    def setUp(self) -> None:
+        self.fields = [('Мама', 'мама', 'S,жен,од=им,ед', 'NOUN,anim,femn sing,nomn'),
+                       ('мыла', 'мыть', 'V,несов,пе=прош,ед,изъяв,жен', 'NOUN,inan,neut sing,gent'),
+                       ('маму', 'мама', 'S,жен,од=вин,ед', 'NOUN,anim,femn sing,accs')]
+        self.store = TokenStore()
+        for fields in self.fields:
+            self.store.append(*fields)
+
+    def test_tokens_format_does_not_change(self):
+        self.assertEqual(len(self.fields), len(self.store))
+        for fields, token in zip(self.fields, self.store):
+            expected = MorphologicalToken(fields[0], fields[1])
+            expected.mystem_tags = fields[2]
+            expected.pymorphy_tags = fields[3]
+            self.assertEqual(str(expected), str(token))
+            self.assertEqual(fields, tuple(getattr(token, name) for name in MorphologicalToken.__slots__))
+        self.assertEqual('мама<S,жен,од=вин,ед>(NOUN,anim,femn sing,accs)', str(self.store[2]))
+        self.assertEqual(str(self.store[-1]), str(self.store[2]))
+
+    def test_strings_are_stored_once(self):
+        self.assertIs(self.store[0].normalized_form, self.store[2].normalized_form)
+        self.assertEqual(11, len(self.store._strings))
+
+    def test_token_is_slotted(self):
+        token = self.store[0]
+        self.assertFalse(hasattr(token, '__dict__'))
+        with self.assertRaises(AttributeError):
+            token.extra = 1
+        self.assertEqual(str(token), str(pickle.loads(pickle.dumps(token))))
@@ -0,0 +1,64 @@
+import os
+import shutil
+import tempfile
+import unittest
+from unittest import mock
+import matplotlib.pyplot as plt
+import visualizer
+from visualizer import visualize, visualize_batch
+
+
+class VisualizerTest(unittest.TestCase):
+    def setUp(self) -> None:
+        self.folder = tempfile.mkdtemp()
+        self.statistics = [{'S': 3, 'V': 1, 'A': 2}, {'ADV': 5}, {'S': 1, 'PR': 1, 'CONJ': 4, 'V': 2, 'A': 1}]
+
+    def tearDown(self) -> None:
+        shutil.rmtree(self.folder)
+
+    def _get_items(self):
+        return [(statistics, os.path.join(self.folder, '{}_image.png'.format(article_id)))
+                for article_id, statistics in enumerate(self.statistics, start=1)]
+
+    def test_visualize_does_not_leave_figures(self):
+        path = os.path.join(self.folder, '1_image.png')
+        visualize(self.statistics[0], path)
+        self.assertTrue(os.path.getsize(path))
+        self.assertEqual([], plt.get_fignums())
+
+    def test_bars_are_drawn_at_once(self):
+        figure = visualizer._create_figure()
+        visualizer._draw(figure, self.statistics[2])
+        axis, = figure.axes
+        self.assertEqual(1, len(axis.containers))
+        self.assertEqual([4, 2, 1, 1, 1], [bar.get_height() for bar in axis.containers[0]])
+        self.assertEqual(['CONJ', 'V', 'S', 'PR', 'A'], [label.get_text() for label in axis.get_xticklabels()])
+
+    def test_batch_in_current_process(self):
+        with mock.patch('visualizer.RENDER_BATCH_SIZE', 2):
+            self.assertEqual(3, visualize_batch(iter(self._get_items()), workers=1))
+        for _, path in self._get_items():
+            self.assertTrue(os.path.getsize(path))
+        self.assertFalse(visualizer._WORKER_STATE['figure'].axes)
+        self.assertEqual([], plt.get_fignums())
+
+    def test_batch_in_process_pool(self):
+        self.assertEqual(3, visualize_batch(self._get_items(), workers=2))
+        for _, path in self._get_items():
+            self.assertTrue(os.path.getsize(path))
+
+    def test_items_are_read_as_they_are_rendered(self):
+        in_flight = []
+
+        def generate_items():
+            for article_id in range(1, 31):
+                in_flight.append(article_id - 1 - len(os.listdir(self.folder)))
+                yield self.statistics[article_id % 3], os.path.join(self.folder, '{}_image.png'.format(article_id))
+
+        with mock.patch('visualizer.RENDER_BATCH_SIZE', 1):
+            self.assertEqual(30, visualize_batch(generate_items(), workers=2))
+        self.assertLessEqual(max(in_flight), visualizer.BATCHES_PER_WORKER * 2)
+        self.assertEqual(30, len(os.listdir(self.folder)))
+
+    def test_empty_batch(self):
+        self.assertEqual(0, visualize_batch([], workers=2))
@@ -6,4 +6,14 @@ import os
 
 PROJECT_ROOT = os.path.dirname(os.path.realpath(__file__))
 ASSETS_PATH = os.path.join(PROJECT_ROOT, 'tmp', 'articles')
+CACHE_PATH = os.path.join(PROJECT_ROOT, 'tmp', 'cache')
+CRAWLER_STATE_PATH = os.path.join(PROJECT_ROOT, 'tmp', 'crawler')
+CHECKPOINT_PATH = os.path.join(CRAWLER_STATE_PATH, 'checkpoint.sqlite')
+FRONTIER_PATH = os.path.join(CRAWLER_STATE_PATH, 'frontier.tsv')
 CRAWLER_CONFIG_PATH = os.path.join(PROJECT_ROOT, 'crawler_config.json')
+PIPELINE_STATE_PATH = os.path.join(PROJECT_ROOT, 'tmp', 'pipeline')
+MORPH_CACHE_PATH = os.path.join(PIPELINE_STATE_PATH, 'pymorphy_cache.json')
+PIPELINE_MANIFEST_PATH = os.path.join(PIPELINE_STATE_PATH, 'manifest.json')
+DATASET_INDEX_PATH = os.path.join(PIPELINE_STATE_PATH, 'dataset_index.json')
+PACKED_CORPUS_PATH = os.path.join(PROJECT_ROOT, 'tmp', 'corpus.pack')
+META_STORE_PATH = os.path.join(PROJECT_ROOT, 'tmp', 'meta.jsonl')
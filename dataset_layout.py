@@ -0,0 +1,97 @@
+"""
+Layouts of the articles folder: flat or sharded into subfolders by article id.
+Run as a script to convert the dataset from one layout to the other
+"""
+
+import argparse
+import os
+import re
+
+from constants import ASSETS_PATH
+
+DATASET_FILE_PATTERN = re.compile(r'(\d+)_(raw\.txt|meta\.json|processed\.txt|image\.png)')
+# file in the root of a sharded dataset, N_raw.txt is then stored as 00/12/1234_raw.txt
+SHARDED_MARKER = '.sharded'
+SHARD_ID_DIGITS = 6
+SHARD_NAME_PATTERN = re.compile(r'\d{2,}')
+
+
+def is_sharded(base_path: str) -> bool:
+    """
+    Checks whether the dataset folder uses the sharded layout
+    """
+    return os.path.exists(os.path.join(base_path, SHARDED_MARKER))
+
+
+def get_shard_dir(article_id: int) -> str:
+    """
+    Returns folder of the article relative to the dataset root in the sharded layout
+    """
+    digits = '{:0{}d}'.format(article_id, SHARD_ID_DIGITS)
+    return os.path.join(digits[:-4], digits[-4:-2])
+
+
+def get_article_file_path(base_path: str, article_id: int, kind: str, sharded: bool = None) -> str:
+    """
+    Returns path of N_kind file (kind is raw.txt, meta.json, processed.txt or image.png) of the article.
+    Callers working with many articles resolve the layout once and pass it as sharded,
+    otherwise it is checked on disk for each path
+    """
+    file_name = '{}_{}'.format(article_id, kind)
+    if is_sharded(base_path) if sharded is None else sharded:
+        return os.path.join(base_path, get_shard_dir(article_id), file_name)
+    return os.path.join(base_path, file_name)
+
+
+def convert_to_sharded(base_path: str):
+    """
+    Moves article files from the dataset root into shard folders.
+    Can be run again if it was interrupted
+    """
+    for entry in list(os.scandir(base_path)):
+        match = DATASET_FILE_PATTERN.fullmatch(entry.name)
+        if not match or not entry.is_file():
+            continue
+        shard_path = os.path.join(base_path, get_shard_dir(int(match.group(1))))
+        os.makedirs(shard_path, exist_ok=True)
+        os.replace(entry.path, os.path.join(shard_path, entry.name))
+    with open(os.path.join(base_path, SHARDED_MARKER), 'w', encoding='utf-8'):
+        pass
+
+
+def convert_to_flat(base_path: str):
+    """
+    Moves article files from shard folders into the dataset root and removes emptied shard folders.
+    Can be run again if it was interrupted
+    """
+    for top_entry in list(os.scandir(base_path)):
+        if not top_entry.is_dir() or not SHARD_NAME_PATTERN.fullmatch(top_entry.name):
+            continue
+        for shard_entry in list(os.scandir(top_entry.path)):
+            if not shard_entry.is_dir() or not SHARD_NAME_PATTERN.fullmatch(shard_entry.name):
+                continue
+            for entry in list(os.scandir(shard_entry.path)):
+                if DATASET_FILE_PATTERN.fullmatch(entry.name) and entry.is_file():
+                    os.replace(entry.path, os.path.join(base_path, entry.name))
+            if not os.listdir(shard_entry.path):
+                os.rmdir(shard_entry.path)
+        if not os.listdir(top_entry.path):
+            os.rmdir(top_entry.path)
+    if is_sharded(base_path):
+        os.remove(os.path.join(base_path, SHARDED_MARKER))
+
+
+def main():
+    arg_parser = argparse.ArgumentParser(description='Converts the articles folder to another layout')
+    arg_parser.add_argument('layout', choices=('sharded', 'flat'))
+    arg_parser.add_argument('--path', type=str, default=ASSETS_PATH, help='articles folder')
+    args = arg_parser.parse_args()
+
+    if args.layout == 'sharded':
+        convert_to_sharded(args.path)
+    else:
+        convert_to_flat(args.path)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,266 @@
+"""
+Meta store: meta information of all articles in a single append-only JSON Lines file.
+Each line is a record of an article, records of the same article are merged in the order they are written.
+A dataset keeps its meta data in the store when its root has the marker file, N_meta.json files are then ignored.
+Run as a script to export the store into N_meta.json files or to import these files into the store
+"""
+
+import argparse
+import json
+import os
+from functools import lru_cache
+
+from constants import ASSETS_PATH, META_STORE_PATH
+from dataset_layout import DATASET_FILE_PATTERN, get_article_file_path, is_sharded
+
+# number of records appended between two fsync calls
+SYNC_BATCH_SIZE = 1000
+WRITE_BUFFER_SIZE = 1024 * 1024
+# size of blocks read from the end of the store when looking for the end of the last complete record
+TAIL_BLOCK_SIZE = 64 * 1024
+# file in the root of a dataset which meta data is kept in the meta store
+META_STORE_MARKER = '.meta_store'
+
+
+class MetaStore:
+    """
+    Append-only JSON Lines file with meta information of articles, synced to disk by batches of records
+    """
+    def __init__(self, path: str = META_STORE_PATH):
+        self.path = path
+        self._file = None
+        self._unsynced = 0
+        # offsets of records of each article, built on the first read
+        self._offsets = None
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc_info):
+        self.close()
+
+    def put(self, meta: dict):
+        """
+        Appends meta data of an article, it must contain the article id
+        """
+        self._append(meta)
+
+    def update(self, article_id: int, fields: dict):
+        """
+        Appends fields of an article that replace previously saved ones
+        """
+        record = {'id': article_id}
+        record.update(fields)
+        self._append(record)
+
+    def get(self, article_id: int):
+        """
+        Returns merged meta data of the article or None if the store has no records of it
+        """
+        offsets = self._get_offsets().get(article_id)
+        if offsets is None:
+            return None
+        meta = {}
+        with open(self.path, 'rb') as file:
+            for offset in offsets:
+                file.seek(offset)
+                meta.update(json.loads(file.readline()))
+        return meta
+
+    def iter_records(self):
+        """
+        Reads the store once and yields its records in the order they were written, records are not merged
+        """
+        if self._file is not None:
+            self._file.flush()
+        if not os.path.exists(self.path):
+            return
+        with open(self.path, 'rb') as file:
+            for line in file:
+                # incomplete last record of an interrupted write is not read
+                if line.endswith(b'\n'):
+                    yield json.loads(line)
+
+    def get_ids(self) -> list:
+        """
+        Returns sorted ids of articles that have records
+        """
+        return sorted(self._get_offsets())
+
+    def sync(self):
+        """
+        Writes appended records to disk
+        """
+        if self._file is not None:
+            self._file.flush()
+            os.fsync(self._file.fileno())
+        self._unsynced = 0
+
+    def close(self):
+        """
+        Syncs appended records and closes the store file, it is opened again by the next append
+        """
+        if self._file is not None:
+            self.sync()
+            self._file.close()
+            self._file = None
+
+    def compact(self):
+        """
+        Rewrites the store with a single merged record per article
+        """
+        tmp_path = self.path + '.tmp'
+        with open(tmp_path, 'wb') as file:
+            for article_id in self.get_ids():
+                file.write(_dump_record(self.get(article_id)))
+            file.flush()
+            os.fsync(file.fileno())
+        self.close()
+        os.replace(tmp_path, self.path)
+        self._offsets = None
+
+    def materialize(self, article_id: int, base_path: str = ASSETS_PATH, sharded: bool = None) -> str:
+        """
+        Writes N_meta.json file of the article from its merged meta data, returns path of the file
+        """
+        path = get_article_file_path(base_path, article_id, 'meta.json', sharded)
+        os.makedirs(os.path.dirname(path), exist_ok=True)
+        with open(path, 'w', encoding='utf-8') as file:
+            file.write(format_meta(self.get(article_id)))
+        return path
+
+    def export(self, base_path: str = ASSETS_PATH):
+        """
+        Writes N_meta.json files of all articles, the dataset then reads its meta data from them
+        """
+        os.makedirs(base_path, exist_ok=True)
+        sharded = is_sharded(base_path)
+        for article_id in self.get_ids():
+            self.materialize(article_id, base_path, sharded)
+        set_meta_store_mode(base_path, False)
+
+    def _append(self, record: dict):
+        if self._file is None:
+            self._open()
+        offset = self._file.tell()
+        self._file.write(_dump_record(record))
+        if self._offsets is not None:
+            self._offsets.setdefault(record['id'], []).append(offset)
+        self._unsynced += 1
+        if self._unsynced >= SYNC_BATCH_SIZE:
+            self.sync()
+
+    def _open(self):
+        """
+        Opens the store for appending, drops an incomplete last record left by an interrupted write
+        """
+        os.makedirs(os.path.dirname(self.path) or '.', exist_ok=True)
+        if os.path.exists(self.path):
+            with open(self.path, 'r+b') as file:
+                file.truncate(_find_records_end(file))
+        self._file = open(self.path, 'ab', buffering=WRITE_BUFFER_SIZE)
+
+    def _get_offsets(self) -> dict:
+        if self._file is not None:
+            self._file.flush()
+        if self._offsets is None:
+            self._offsets = {}
+            if os.path.exists(self.path):
+                with open(self.path, 'rb') as file:
+                    offset = 0
+                    for line in file:
+                        # incomplete last record of an interrupted write is not read
+                        if line.endswith(b'\n'):
+                            self._offsets.setdefault(json.loads(line)['id'], []).append(offset)
+                        offset += len(line)
+        return self._offsets
+
+
+def format_meta(meta: dict) -> str:
+    """
+    Formats meta data in the same way as N_meta.json files are written
+    """
+    return json.dumps(meta, sort_keys=False, indent=4, ensure_ascii=False, separators=(',', ': '))
+
+
+def uses_meta_store(base_path: str) -> bool:
+    """
+    Checks whether meta data of the dataset is kept in the meta store
+    """
+    return os.path.exists(os.path.join(base_path, META_STORE_MARKER))
+
+
+def set_meta_store_mode(base_path: str, enabled: bool):
+    """
+    Marks the dataset as keeping its meta data in the meta store or in N_meta.json files
+    """
+    marker_path = os.path.join(base_path, META_STORE_MARKER)
+    if enabled:
+        with open(marker_path, 'w', encoding='utf-8'):
+            pass
+    elif os.path.exists(marker_path):
+        os.remove(marker_path)
+
+
+def _dump_record(record: dict) -> bytes:
+    return json.dumps(record, ensure_ascii=False, separators=(',', ':')).encode('utf-8') + b'\n'
+
+
+def _find_records_end(file) -> int:
+    """
+    Returns size of the file without the data after its last line end
+    """
+    end = file.seek(0, os.SEEK_END)
+    while end > 0:
+        start = max(end - TAIL_BLOCK_SIZE, 0)
+        file.seek(start)
+        line_end = file.read(end - start).rfind(b'\n')
+        if line_end != -1:
+            return start + line_end + 1
+        end = start
+    return 0
+
+
+@lru_cache(maxsize=None)
+def open_meta_store(path: str = META_STORE_PATH) -> MetaStore:
+    """
+    Opens meta store once per process, so that all readers and writers share its records index
+    """
+    return MetaStore(path)
+
+
+def import_meta_files(base_path: str = ASSETS_PATH, store_path: str = META_STORE_PATH):
+    """
+    Appends meta data of each N_meta.json file of the articles folder, flat or sharded, to the store,
+    the dataset then reads its meta data from the store
+    """
+    with MetaStore(store_path) as store:
+        for folder, _, file_names in os.walk(base_path):
+            for file_name in sorted(file_names):
+                match = DATASET_FILE_PATTERN.fullmatch(file_name)
+                if not match or match.group(2) != 'meta.json':
+                    continue
+                with open(os.path.join(folder, file_name), encoding='utf-8') as file:
+                    store.put(json.load(file))
+    set_meta_store_mode(base_path, True)
+
+
+def main():
+    arg_parser = argparse.ArgumentParser(description='Exports the meta store into meta files and back')
+    arg_parser.add_argument('action', choices=('export', 'import', 'compact'))
+    arg_parser.add_argument('--path', type=str, default=ASSETS_PATH, help='articles folder')
+    arg_parser.add_argument('--store', type=str, default=META_STORE_PATH, help='meta store file')
+    args = arg_parser.parse_args()
+
+    if args.action == 'import':
+        import_meta_files(args.path, args.store)
+        return
+    with MetaStore(args.store) as store:
+        if args.action == 'export':
+            store.export(args.path)
+        else:
+            store.compact()
+
+
+if __name__ == "__main__":
+    main()
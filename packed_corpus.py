@@ -0,0 +1,226 @@
+"""
+Packed corpus: raw texts and meta files of all articles in a single file read through mmap.
+Run as a script to pack the articles folder or to unpack a packed corpus back into it
+"""
+
+import argparse
+import io
+import json
+import mmap
+import os
+import struct
+from functools import lru_cache
+
+from article import Article
+from constants import ASSETS_PATH, META_STORE_PATH, PACKED_CORPUS_PATH
+from dataset_layout import DATASET_FILE_PATTERN, get_article_file_path, is_sharded
+from meta_store import format_meta, open_meta_store, set_meta_store_mode, uses_meta_store
+
+PACK_MAGIC = b'CTLRPACK'
+PACK_VERSION = 1
+# magic, format version, offset of the index, number of articles
+PACK_HEADER = struct.Struct('<8sIQQ')
+# article id, offset and length of raw text, offset and length of meta file
+PACK_INDEX_ENTRY = struct.Struct('<QQQQQ')
+
+
+class PackFormatError(Exception):
+    """
+    Custom error
+    """
+
+
+class PackedCorpus:
+    """
+    Read-only access to a packed corpus, texts are decoded straight from the mapped file
+    """
+    def __init__(self, path: str):
+        self.path = path
+        with open(path, 'rb') as file:
+            if os.fstat(file.fileno()).st_size < PACK_HEADER.size:
+                raise PackFormatError('{} is too short to be a packed corpus'.format(path))
+            self._data = mmap.mmap(file.fileno(), 0, access=mmap.ACCESS_READ)
+        self._view = memoryview(self._data)
+        magic, version, index_offset, articles_number = PACK_HEADER.unpack_from(self._data)
+        if magic != PACK_MAGIC or version != PACK_VERSION:
+            raise PackFormatError('{} is not a packed corpus of version {}'.format(path, PACK_VERSION))
+        if index_offset + articles_number * PACK_INDEX_ENTRY.size != len(self._data):
+            raise PackFormatError('{} is truncated'.format(path))
+        self._index = {entry[0]: entry[1:] for entry in
+                       PACK_INDEX_ENTRY.iter_unpack(self._view[index_offset:])}
+
+    def __len__(self):
+        return len(self._index)
+
+    def get_ids(self) -> list:
+        """
+        Returns sorted ids of packed articles
+        """
+        return sorted(self._index)
+
+    def get_content(self, article_id: int, kind: str) -> memoryview:
+        """
+        Returns bytes of the packed N_kind file (kind is raw.txt or meta.json) without copying them
+        """
+        raw_offset, raw_length, meta_offset, meta_length = self._index[article_id]
+        if kind == 'raw.txt':
+            return self._view[raw_offset:raw_offset + raw_length]
+        return self._view[meta_offset:meta_offset + meta_length]
+
+    def get_raw_text(self, article_id: int) -> str:
+        """
+        Decodes raw text of the article from the mapped file
+        """
+        return str(self.get_content(article_id, 'raw.txt'), 'utf-8')
+
+    def get_raw_text_size(self, article_id: int) -> int:
+        """
+        Returns size of raw text of the article in bytes
+        """
+        return self._index[article_id][1]
+
+    def get_meta(self, article_id: int) -> dict:
+        """
+        Returns meta information of the article
+        """
+        return json.loads(str(self.get_content(article_id, 'meta.json'), 'utf-8'))
+
+    def close(self):
+        """
+        Unmaps the file
+        """
+        self._view.release()
+        self._data.close()
+
+
+@lru_cache(maxsize=None)
+def open_packed_corpus(path: str) -> PackedCorpus:
+    """
+    Opens packed corpus once per process, so that articles can be sent to other processes by path
+    """
+    return PackedCorpus(path)
+
+
+class PackedArticle(Article):
+    """
+    Article which raw text is read from a packed corpus, processed text is saved as usual
+    """
+    def __init__(self, pack_path: str, article_id: int, sharded: bool = None):
+        super().__init__(url=None, article_id=article_id)
+        self.pack_path = pack_path
+        self.sharded = sharded
+
+    def get_raw_text(self):
+        """
+        Gets a raw text for requested article from the packed corpus
+        """
+        return open_packed_corpus(self.pack_path).get_raw_text(self.article_id)
+
+    def get_raw_text_size(self):
+        """
+        Gets a size of packed raw text in bytes
+        """
+        return open_packed_corpus(self.pack_path).get_raw_text_size(self.article_id)
+
+    def open_raw_text(self):
+        """
+        Opens raw text of the article to read it by parts
+        """
+        return io.StringIO(self.get_raw_text())
+
+
+class PackedCorpusManager:
+    """
+    Works with articles of a packed corpus in the same way as CorpusManager does with the articles folder
+    """
+    def __init__(self, pack_path: str = PACKED_CORPUS_PATH):
+        self.pack_path = pack_path
+        # processed texts are saved to the articles folder, its layout is checked once for all of them
+        sharded = is_sharded(ASSETS_PATH)
+        self._storage = {article_id: PackedArticle(pack_path, article_id, sharded)
+                         for article_id in open_packed_corpus(pack_path).get_ids()}
+
+    def get_articles(self):
+        """
+        Returns storage params
+        """
+        return self._storage
+
+
+def pack_dataset(base_path: str = ASSETS_PATH, pack_path: str = PACKED_CORPUS_PATH):
+    """
+    Packs raw texts and meta data of the articles folder, flat or sharded, into a single file.
+    Meta data of a dataset that keeps it in the meta store is packed from the store, no meta files are written
+    """
+    article_ids = [int(match.group(1)) for _, _, file_names in os.walk(base_path)
+                   for match in map(DATASET_FILE_PATTERN.fullmatch, file_names)
+                   if match and match.group(2) == 'raw.txt']
+
+    os.makedirs(os.path.dirname(pack_path) or '.', exist_ok=True)
+    tmp_path = pack_path + '.tmp'
+    entries = []
+    sharded = is_sharded(base_path)
+    meta_store = open_meta_store(META_STORE_PATH) if uses_meta_store(base_path) else None
+    with open(tmp_path, 'wb') as pack_file:
+        pack_file.write(PACK_HEADER.pack(PACK_MAGIC, PACK_VERSION, 0, 0))
+        for article_id in sorted(article_ids):
+            entry = [article_id]
+            for kind in ('raw.txt', 'meta.json'):
+                content = _read_article_file(base_path, article_id, kind, sharded, meta_store)
+                entry.extend((pack_file.tell(), len(content)))
+                pack_file.write(content)
+            entries.append(entry)
+        index_offset = pack_file.tell()
+        for entry in entries:
+            pack_file.write(PACK_INDEX_ENTRY.pack(*entry))
+        pack_file.seek(0)
+        pack_file.write(PACK_HEADER.pack(PACK_MAGIC, PACK_VERSION, index_offset, len(entries)))
+    os.replace(tmp_path, pack_path)
+
+
+def _read_article_file(base_path: str, article_id: int, kind: str, sharded: bool, meta_store) -> bytes:
+    """
+    Reads N_kind file of the article, meta data is formatted from the meta store instead when it is given
+    """
+    if kind == 'meta.json' and meta_store is not None:
+        return format_meta(meta_store.get(article_id)).encode('utf-8')
+    with open(get_article_file_path(base_path, article_id, kind, sharded), 'rb') as file:
+        return file.read()
+
+
+def unpack_dataset(pack_path: str = PACKED_CORPUS_PATH, base_path: str = ASSETS_PATH):
+    """
+    Writes N_raw.txt and N_meta.json files of each packed article into the articles folder,
+    the folder then reads its meta data from these files
+    """
+    corpus = PackedCorpus(pack_path)
+    os.makedirs(base_path, exist_ok=True)
+    sharded = is_sharded(base_path)
+    try:
+        for article_id in corpus.get_ids():
+            for kind in ('raw.txt', 'meta.json'):
+                path = get_article_file_path(base_path, article_id, kind, sharded)
+                if sharded:
+                    os.makedirs(os.path.dirname(path), exist_ok=True)
+                with open(path, 'wb') as file:
+                    file.write(corpus.get_content(article_id, kind))
+    finally:
+        corpus.close()
+    set_meta_store_mode(base_path, False)
+
+
+def main():
+    arg_parser = argparse.ArgumentParser(description='Packs the articles folder into a single file and back')
+    arg_parser.add_argument('action', choices=('pack', 'unpack'))
+    arg_parser.add_argument('--path', type=str, default=ASSETS_PATH, help='articles folder')
+    arg_parser.add_argument('--pack', type=str, default=PACKED_CORPUS_PATH, help='packed corpus file')
+    args = arg_parser.parse_args()
+
+    if args.action == 'pack':
+        pack_dataset(args.path, args.pack)
+    else:
+        unpack_dataset(args.pack, args.path)
+
+
+if __name__ == "__main__":
+    main()
@@ -2,7 +2,49 @@
 Pipeline for text processing implementation
 """
 
-from typing import List
+import argparse
+import hashlib
+import json
+import os
+import time
+from array import array
+from bisect import bisect_left
+from collections import OrderedDict, deque
+from collections.abc import Mapping
+from concurrent.futures import ProcessPoolExecutor
+from functools import partial
+from importlib import metadata
+
+from pymorphy2 import MorphAnalyzer
+from pymystem3 import Mystem
+
+from article import CachedArticle, TextCache
+from constants import ASSETS_PATH, DATASET_INDEX_PATH, META_STORE_PATH, MORPH_CACHE_PATH, PIPELINE_MANIFEST_PATH
+from dataset_layout import DATASET_FILE_PATTERN, SHARD_NAME_PATTERN, SHARDED_MARKER, get_shard_dir, is_sharded
+from meta_store import META_STORE_MARKER, open_meta_store, uses_meta_store
+from packed_corpus import PackedCorpusManager
+
+# number of articles analyzed by a single mystem call, 1 means one call per article
+BATCH_SIZE = 1
+# latin word mystem leaves as a standalone unanalyzed token between joined articles
+BATCH_SENTINEL = 'zzarticleseparatorzz'
+MORPH_CACHE_SIZE = 200000
+# raw texts larger than this number of bytes are analyzed by parts and never joined into batches
+STREAM_MIN_SIZE = 1024 * 1024
+# approximate number of characters analyzed by a single mystem call when streaming
+STREAM_CHUNK_SIZE = 64 * 1024
+# number of chunks submitted to the pool per worker process, processed texts of the rest are not held in memory
+CHUNKS_PER_WORKER = 2
+# increase when processing logic or output format changes, so incremental runs process everything again
+PIPELINE_VERSION = 1
+TAGGER_PACKAGES = ('pymystem3', 'pymorphy2', 'pymorphy2-dicts-ru')
+TOKEN_FIELDS = ('original_word', 'normalized_form', 'mystem_tags', 'pymorphy_tags')
+DATASET_FILE_KINDS = {'raw.txt': 'raw', 'meta.json': 'meta', 'processed.txt': 'processed', 'image.png': 'image'}
+# directory changed less than this number of nanoseconds before its scan may still get files
+# with the same mtime, the index of such a directory is not saved
+INDEX_RACY_INTERVAL = 2 * 10 ** 9
+# pipeline owned by a worker process of the parallel run, keeps its analyzers between tasks
+_WORKER_STATE = {}
 
 
 class EmptyDirectoryError(Exception):
@@ -27,11 +69,333 @@ class MorphologicalToken:
     """
     Stores language params for each processed token
     """
+    __slots__ = TOKEN_FIELDS
+
     def __init__(self, original_word, normalized_form):
-        pass
+        self.original_word = original_word
+        self.normalized_form = normalized_form
+        self.mystem_tags = ''
+        self.pymorphy_tags = ''
 
     def __str__(self):
-        return "MorphologicalToken instance here"
+        return "{}<{}>({})".format(self.normalized_form, self.mystem_tags, self.pymorphy_tags)
+
+
+class TokenObserver:
+    """
+    Base of stages that receive tokens of processed articles in the same pass, without reading processed texts
+    """
+    def observe(self, article_id: int, tokens):
+        """
+        Receives tokens of an article, long articles are given by consecutive parts in several calls
+        """
+
+
+class TokenStore:
+    """
+    Columnar storage of processed tokens: each string is stored once,
+    tokens keep ids of their strings in typed arrays and are created only when accessed
+    """
+    def __init__(self):
+        self._strings = []
+        self._string_ids = {}
+        self._columns = tuple(array('I') for _ in TOKEN_FIELDS)
+
+    def __len__(self):
+        return len(self._columns[0])
+
+    def __getitem__(self, index: int) -> MorphologicalToken:
+        original_word, normalized_form, mystem_tags, pymorphy_tags = (
+            self._strings[column[index]] for column in self._columns)
+        token = MorphologicalToken(original_word, normalized_form)
+        token.mystem_tags = mystem_tags
+        token.pymorphy_tags = pymorphy_tags
+        return token
+
+    def __iter__(self):
+        for index in range(len(self)):
+            yield self[index]
+
+    def _intern(self, string: str) -> int:
+        string_id = self._string_ids.get(string)
+        if string_id is None:
+            string_id = len(self._strings)
+            self._strings.append(string)
+            self._string_ids[string] = string_id
+        return string_id
+
+    def append(self, original_word: str, normalized_form: str, mystem_tags: str, pymorphy_tags: str):
+        """
+        Adds a token to the end of the store
+        """
+        for column, string in zip(self._columns, (original_word, normalized_form, mystem_tags, pymorphy_tags)):
+            column.append(self._intern(string))
+
+
+class MorphTagsCache:
+    """
+    LRU cache of pymorphy2 tags keyed by word, counts hits and misses
+    """
+    def __init__(self, morph_analyzer: MorphAnalyzer, max_size: int = MORPH_CACHE_SIZE):
+        self.morph_analyzer = morph_analyzer
+        self.max_size = max_size
+        self.hits = 0
+        self.misses = 0
+        self._tags = OrderedDict()
+
+    def __len__(self):
+        return len(self._tags)
+
+    def get_tags(self, word: str) -> str:
+        """
+        Returns tags of the most probable pymorphy2 parse of the word
+        """
+        # the most probable parse depends on the case, for example of initials, so words are kept as they are
+        tags = self._tags.get(word)
+        if tags is not None:
+            self.hits += 1
+            self._tags.move_to_end(word)
+            return tags
+        self.misses += 1
+        tags = str(self.morph_analyzer.parse(word)[0].tag)
+        self._tags[word] = tags
+        if len(self._tags) > self.max_size:
+            self._tags.popitem(last=False)
+        return tags
+
+    def entries(self) -> list:
+        """
+        Returns (word, tags) pairs from the least to the most recently used one
+        """
+        return list(self._tags.items())
+
+    def update(self, entries: list):
+        """
+        Adds (word, tags) pairs as the most recently used ones, keeps the last ones if they do not fit
+        """
+        for word, tags in entries[-self.max_size:]:
+            self._tags[word] = tags
+            self._tags.move_to_end(word)
+        while len(self._tags) > self.max_size:
+            self._tags.popitem(last=False)
+
+    def load(self, path: str = MORPH_CACHE_PATH, tagging_config: dict = None):
+        """
+        Loads entries saved by a previous run, entries saved with other tagger versions are ignored
+        """
+        tagging_config = get_tagging_config() if tagging_config is None else tagging_config
+        try:
+            with open(path, encoding='utf-8') as file:
+                cache = json.load(file)
+        except (OSError, ValueError):
+            return
+        if isinstance(cache, dict) and cache.get('tagging_config') == tagging_config:
+            self.update(cache['entries'])
+
+    def save(self, path: str = MORPH_CACHE_PATH, tagging_config: dict = None):
+        """
+        Saves entries keeping their order of use together with the tagger versions that produced them
+        """
+        tagging_config = get_tagging_config() if tagging_config is None else tagging_config
+        os.makedirs(os.path.dirname(path), exist_ok=True)
+        tmp_path = path + '.tmp'
+        with open(tmp_path, 'w', encoding='utf-8') as file:
+            json.dump({'tagging_config': tagging_config, 'entries': self.entries()}, file, ensure_ascii=False)
+        os.replace(tmp_path, path)
+
+
+class ProcessingManifest:
+    """
+    Hashes of raw texts processed with the current tagging configuration
+    """
+    def __init__(self, path: str = PIPELINE_MANIFEST_PATH, tagging_config: dict = None):
+        self.path = path
+        self.tagging_config = get_tagging_config() if tagging_config is None else tagging_config
+        self._hashes = {}
+
+    def load(self):
+        """
+        Loads hashes saved by a previous run if it used the same tagging configuration
+        """
+        try:
+            with open(self.path, encoding='utf-8') as file:
+                manifest = json.load(file)
+        except (OSError, ValueError):
+            return
+        if manifest.get('tagging_config') == self.tagging_config:
+            self._hashes = manifest['articles']
+
+    def save(self):
+        """
+        Saves hashes together with the tagging configuration
+        """
+        os.makedirs(os.path.dirname(self.path), exist_ok=True)
+        tmp_path = self.path + '.tmp'
+        with open(tmp_path, 'w', encoding='utf-8') as file:
+            json.dump({'tagging_config': self.tagging_config, 'articles': self._hashes}, file)
+        os.replace(tmp_path, self.path)
+
+    def is_processed(self, article_id: int, raw_hash: str) -> bool:
+        """
+        Checks whether the article was processed from the raw text with the given hash
+        """
+        return self._hashes.get(str(article_id)) == raw_hash
+
+    def update(self, article_id: int, raw_hash: str):
+        """
+        Remembers hash of the raw text the article was processed from
+        """
+        self._hashes[str(article_id)] = raw_hash
+
+    def retain(self, article_ids):
+        """
+        Forgets articles that are not in the corpus anymore
+        """
+        article_ids = {str(article_id) for article_id in article_ids}
+        self._hashes = {key: value for key, value in self._hashes.items() if key in article_ids}
+
+
+class DatasetIndex:
+    """
+    Kinds of files (raw, meta, processed, image) present for each article id,
+    together with files and folders that do not belong to the dataset.
+    Paths of unknown files and folders are relative to the dataset root
+    """
+    def __init__(self, path: str):
+        self.path = path
+        self.sharded = False
+        self.meta_stored = False
+        self.mtimes = {}
+        self.articles = {}
+        self.unknown_files = []
+        self.directories = []
+
+    def scan(self):
+        """
+        Builds the index by a single pass over the folder and its shard folders
+        """
+        self.sharded = is_sharded(self.path)
+        self.meta_stored = uses_meta_store(self.path)
+        self.mtimes = {}
+        self.articles = {}
+        self.unknown_files = []
+        self.directories = []
+        self._scan_folder('', 0)
+
+    def _scan_folder(self, relative_path: str, depth: int):
+        folder = os.path.join(self.path, relative_path)
+        self.mtimes[relative_path] = os.stat(folder).st_mtime_ns
+        with os.scandir(folder) as entries:
+            for entry in entries:
+                entry_path = os.path.join(relative_path, entry.name)
+                if entry.is_dir():
+                    if self.sharded and depth < 2 and SHARD_NAME_PATTERN.fullmatch(entry.name):
+                        self._scan_folder(entry_path, depth + 1)
+                    else:
+                        self.directories.append(entry_path)
+                    continue
+                if self.sharded and entry_path == SHARDED_MARKER \
+                        or self.meta_stored and entry_path == META_STORE_MARKER:
+                    continue
+                match = DATASET_FILE_PATTERN.fullmatch(entry.name)
+                article_dir = get_shard_dir(int(match.group(1))) if match and self.sharded else ''
+                if not match or article_dir != relative_path:
+                    self.unknown_files.append(entry_path)
+                    continue
+                self.articles.setdefault(int(match.group(1)), set()).add(DATASET_FILE_KINDS[match.group(2)])
+
+    def load(self, index_path: str) -> bool:
+        """
+        Loads the index saved for the folder if none of its folders was changed since then
+        """
+        try:
+            with open(index_path, encoding='utf-8') as file:
+                index = json.load(file)
+        except (OSError, ValueError):
+            return False
+        if index.get('path') != os.path.abspath(self.path) or not index.get('mtimes'):
+            return False
+        for relative_path, mtime_ns in index['mtimes'].items():
+            try:
+                if os.stat(os.path.join(self.path, relative_path)).st_mtime_ns != mtime_ns:
+                    return False
+            except OSError:
+                return False
+        self.sharded = index['sharded']
+        self.meta_stored = index.get('meta_stored', False)
+        self.mtimes = index['mtimes']
+        self.articles = {int(article_id): set(kinds) for article_id, kinds in index['articles'].items()}
+        self.unknown_files = index['unknown_files']
+        self.directories = index['directories']
+        return True
+
+    def save(self, index_path: str):
+        """
+        Saves the index unless a folder was changed right before the scan
+        """
+        if time.time_ns() - max(self.mtimes.values()) < INDEX_RACY_INTERVAL:
+            return
+        os.makedirs(os.path.dirname(index_path), exist_ok=True)
+        tmp_path = index_path + '.tmp'
+        with open(tmp_path, 'w', encoding='utf-8') as file:
+            json.dump({'path': os.path.abspath(self.path),
+                       'sharded': self.sharded,
+                       'meta_stored': self.meta_stored,
+                       'mtimes': self.mtimes,
+                       'articles': {article_id: sorted(kinds) for article_id, kinds in self.articles.items()},
+                       'unknown_files': self.unknown_files,
+                       'directories': self.directories}, file)
+        os.replace(tmp_path, index_path)
+
+    def get_ids(self, kind: str) -> list:
+        """
+        Returns sorted ids of articles that have a file of the given kind
+        """
+        return sorted(article_id for article_id, kinds in self.articles.items() if kind in kinds)
+
+
+def get_dataset_index(path: str) -> DatasetIndex:
+    """
+    Returns the cached index of the dataset folder or scans the folder again if it was changed
+    """
+    index = DatasetIndex(path)
+    if not index.load(DATASET_INDEX_PATH):
+        index.scan()
+        index.save(DATASET_INDEX_PATH)
+    return index
+
+
+class ArticleStorage(Mapping):
+    """
+    Articles of the dataset by id, each article is created on first access
+    """
+    def __init__(self, article_ids: list, text_cache: TextCache = None, sharded: bool = None,
+                 meta_stored: bool = None):
+        self._ids = sorted(article_ids)
+        self._articles = {}
+        self.text_cache = text_cache
+        # layout of the dataset is given to articles, so that their paths are resolved without checking it
+        self.sharded = sharded
+        self.meta_stored = meta_stored
+
+    def __getitem__(self, article_id):
+        article = self._articles.get(article_id)
+        if article is None:
+            if article_id not in self:
+                raise KeyError(article_id)
+            article = CachedArticle(article_id, self.text_cache, self.sharded, self.meta_stored)
+            self._articles[article_id] = article
+        return article
+
+    def __contains__(self, article_id):
+        position = bisect_left(self._ids, article_id)
+        return position < len(self._ids) and self._ids[position] == article_id
+
+    def __iter__(self):
+        return iter(self._ids)
+
+    def __len__(self):
+        return len(self._ids)
 
 
 class CorpusManager:
@@ -39,50 +403,303 @@ class CorpusManager:
     Works with articles and stores them
     """
     def __init__(self, path_to_raw_txt_data: str):
-        pass
+        self.path_to_raw_txt_data = path_to_raw_txt_data
+        self.dataset_index = None
+        self._storage = {}
+        self._scan_dataset()
 
     def _scan_dataset(self):
         """
         Register each dataset entry
         """
-        pass
+        self.dataset_index = get_dataset_index(self.path_to_raw_txt_data)
+        self._storage = ArticleStorage(self.dataset_index.get_ids('raw'), TextCache(), self.dataset_index.sharded,
+                                       self.dataset_index.meta_stored)
 
     def get_articles(self):
         """
         Returns storage params
         """
-        pass
+        return self._storage
 
 
 class TextProcessingPipeline:
     """
     Process articles from corpus manager
     """
-    def __init__(self, corpus_manager: CorpusManager):
-        pass
+    def __init__(self, corpus_manager: CorpusManager, batch_size: int = BATCH_SIZE, workers: int = 1):
+        self.corpus_manager = corpus_manager
+        self.batch_size = batch_size
+        self.workers = workers
+        self._text = ''
+        self._mystem = Mystem()
+        self.morph_cache = MorphTagsCache(MorphAnalyzer())
+        self.manifest = None
+        self.observers = []
 
     def run(self):
         """
-        Runs pipeline process scenario
+        Runs pipeline process scenario.
+        With several workers articles are processed in a pool of processes and saved in the main one.
+        With a manifest only articles with changed raw texts are processed.
+        Observers receive tokens in the current process, so they can be used with a single worker only
+        """
+        if self.observers and self.workers != 1:
+            raise ValueError('token observers need a single worker, got {} workers'.format(self.workers))
+        articles = [article for _, article in sorted(self.corpus_manager.get_articles().items())]
+        raw_hashes = {}
+        if self.manifest is not None:
+            articles, raw_hashes = self._find_changed_articles(articles)
+        chunk_size = max(self.batch_size, 1)
+        chunks = [articles[start:start + chunk_size] for start in range(0, len(articles), chunk_size)]
+        try:
+            if self.workers == 1:
+                self._save_results(chunks, map(self.process_articles, chunks), raw_hashes)
+                return
+
+            # workers start from the entries known to the main process, their own entries are not merged back
+            with ProcessPoolExecutor(max_workers=self.workers, initializer=_init_worker,
+                                     initargs=(self.batch_size, self.morph_cache.entries())) as executor:
+                self._save_results(chunks, self._iter_results_in_window(executor, chunks), raw_hashes)
+        finally:
+            if self.manifest is not None:
+                self.manifest.save()
+
+    def _iter_results_in_window(self, executor: ProcessPoolExecutor, chunks: list):
+        """
+        Yields processed texts of chunks in their order, a few chunks per worker are submitted at a time
+        """
+        window = CHUNKS_PER_WORKER * (self.workers or os.cpu_count() or 1)
+        running = deque()
+        for chunk in chunks:
+            if len(running) >= window:
+                yield running.popleft().result()
+            running.append(executor.submit(_process_articles_in_worker, chunk))
+        while running:
+            yield running.popleft().result()
+
+    def _find_changed_articles(self, articles: list):
+        """
+        Returns articles that are not processed from their current raw texts and hashes of these texts
+        """
+        self.manifest.retain(article.article_id for article in articles)
+        changed = []
+        raw_hashes = {}
+        for article in articles:
+            raw_hash = hashlib.sha1(article.get_raw_text().encode('utf-8')).hexdigest()
+            if not self.manifest.is_processed(article.article_id, raw_hash) or not article.has_processed_text():
+                changed.append(article)
+                raw_hashes[article.article_id] = raw_hash
+        return changed, raw_hashes
+
+    def _save_results(self, chunks, results, raw_hashes: dict):
+        """
+        Saves processed texts of each chunk and records them in the manifest
+        """
+        for chunk, processed_texts in zip(chunks, results):
+            save_processed_articles(chunk, processed_texts)
+            if self.manifest is not None:
+                for article in chunk:
+                    self.manifest.update(article.article_id, raw_hashes[article.article_id])
+
+    def process_articles(self, articles: list) -> list:
+        """
+        Processes raw texts of given articles, returns processed text of each one.
+        Long articles are saved while they are processed, None is returned for them
+        """
+        processed_texts = {}
+        short_articles = []
+        texts = []
+        for article in articles:
+            if article.get_raw_text_size() > STREAM_MIN_SIZE:
+                with article.open_raw_text() as file:
+                    article.save_processed_fragments(self._iter_processed_fragments(file, article.article_id))
+                processed_texts[article.article_id] = None
+                continue
+            texts.append(article.get_raw_text())
+            short_articles.append(article)
+        for article, tokens in zip(short_articles, self._process_batch(texts)):
+            self._notify_observers(article.article_id, tokens)
+            processed_texts[article.article_id] = ' '.join(map(str, tokens))
+        return [processed_texts[article.article_id] for article in articles]
+
+    def _iter_processed_fragments(self, file, article_id: int):
+        """
+        Analyzes text by parts and yields processed tokens separated by spaces
         """
-        pass
+        separator = ''
+        for text in iter_text_chunks(file):
+            tokens = self._tokens_from_analysis(self._mystem.analyze(text))
+            self._notify_observers(article_id, tokens)
+            for token in tokens:
+                yield separator + str(token)
+                separator = ' '
 
-    def _process(self) -> List[type(MorphologicalToken)]:
+    def _notify_observers(self, article_id: int, tokens: TokenStore):
+        for observer in self.observers:
+            observer.observe(article_id, tokens)
+
+    def _process(self) -> TokenStore:
         """
         Performs processing of each text
         """
-        pass
+        return self._tokens_from_analysis(self._mystem.analyze(self._text))
+
+    def _process_batch(self, texts: list) -> list:
+        """
+        Analyzes several texts with a single mystem call, returns a list of tokens per text
+        """
+        if len(texts) > 1 and not any(BATCH_SENTINEL in text.lower() for text in texts):
+            separator = '\n{}\n'.format(BATCH_SENTINEL)
+            analyses = split_batch_analysis(self._mystem.analyze(separator.join(texts)), len(texts))
+            if analyses is not None:
+                return [self._tokens_from_analysis(analysis) for analysis in analyses]
+
+        tokens = []
+        for text in texts:
+            self._text = text
+            tokens.append(self._process())
+        return tokens
+
+    def _tokens_from_analysis(self, analysis: list) -> TokenStore:
+        """
+        Builds tokens from mystem output skipping punctuation and unknown words
+        """
+        tokens = TokenStore()
+        for item in analysis:
+            if not item.get('analysis'):
+                continue
+            tokens.append(item['text'], item['analysis'][0]['lex'], item['analysis'][0]['gr'],
+                          self.morph_cache.get_tags(item['text']))
+        return tokens
+
+
+def save_processed_articles(articles: list, processed_texts: list):
+    """
+    Saves processed text of each article that is not saved yet
+    """
+    for article, processed_text in zip(articles, processed_texts):
+        if processed_text is not None:
+            article.save_processed(processed_text)
+
+
+def iter_text_chunks(file, chunk_size: int = None):
+    """
+    Reads text by parts of about chunk_size characters that end at a line end,
+    or at a space if a line is longer, so that words are not split
+    """
+    rest = ''
+    for block in iter(partial(file.read, chunk_size or STREAM_CHUNK_SIZE), ''):
+        text = rest + block
+        cut = text.rfind('\n') + 1 or text.rfind(' ') + 1
+        if cut:
+            yield text[:cut]
+        rest = text[cut:]
+    if rest:
+        yield rest
+
+
+def get_tagging_config() -> dict:
+    """
+    Describes everything that affects processed texts: pipeline version and tagger package versions
+    """
+    tagging_config = {'pipeline_version': PIPELINE_VERSION}
+    for package in TAGGER_PACKAGES:
+        try:
+            tagging_config[package] = metadata.version(package)
+        except metadata.PackageNotFoundError:
+            tagging_config[package] = None
+    return tagging_config
+
+
+def _init_worker(batch_size: int, morph_cache_entries: list):
+    """
+    Creates analyzers of a worker process once for all its tasks
+    """
+    pipeline = TextProcessingPipeline(None, batch_size)
+    pipeline.morph_cache.update(morph_cache_entries)
+    _WORKER_STATE['pipeline'] = pipeline
+
+
+def _process_articles_in_worker(articles: list) -> list:
+    """
+    Processes articles with the pipeline of the current worker process
+    """
+    return _WORKER_STATE['pipeline'].process_articles(articles)
+
+
+def split_batch_analysis(analysis: list, texts_number: int):
+    """
+    Splits mystem output of joined texts by sentinel tokens,
+    returns None if the output does not contain exactly one part per text
+    """
+    parts = [[]]
+    for item in analysis:
+        if item['text'].strip().lower() == BATCH_SENTINEL:
+            parts.append([])
+        else:
+            parts[-1].append(item)
+    if len(parts) != texts_number:
+        return None
+    return parts
 
 
 def validate_dataset(path_to_validate):
     """
     Validates folder with assets
     """
-    pass
+    if not os.path.exists(path_to_validate):
+        raise FileNotFoundError
+    if not os.path.isdir(path_to_validate):
+        raise NotADirectoryError
+
+    index = get_dataset_index(path_to_validate)
+    if not index.articles and not index.unknown_files and not index.directories:
+        raise EmptyDirectoryError
+    if index.directories:
+        raise UnknownDatasetError
+    if index.unknown_files:
+        raise InconsistentDatasetError
+
+    raw_ids = index.get_ids('raw')
+    # meta files of a dataset which meta data is kept in the meta store are not read, so they are not checked
+    meta_ids = open_meta_store(META_STORE_PATH).get_ids() if index.meta_stored else index.get_ids('meta')
+    if not raw_ids or raw_ids != meta_ids:
+        raise InconsistentDatasetError
+    if raw_ids[0] not in (0, 1) or raw_ids[-1] - raw_ids[0] + 1 != len(raw_ids):
+        raise InconsistentDatasetError
 
 
 def main():
-    print('Your code goes here')
+    arg_parser = argparse.ArgumentParser(description='Processes collected articles')
+    arg_parser.add_argument('--workers', type=int, default=1,
+                            help='number of processes with own analyzers, 1 processes articles in place')
+    arg_parser.add_argument('--batch-size', type=int, default=BATCH_SIZE,
+                            help='number of articles analyzed by a single mystem call')
+    arg_parser.add_argument('--morph-cache', action='store_true',
+                            help='reuse pymorphy2 tags saved by the previous run and save them after this one')
+    arg_parser.add_argument('--incremental', action='store_true',
+                            help='process only articles changed since the previous run')
+    arg_parser.add_argument('--packed', action='store_true',
+                            help='read raw texts from the corpus packed by packed_corpus.py, '
+                                 'processed texts are saved to the articles folder as usual')
+    args = arg_parser.parse_args()
+
+    if args.packed:
+        os.makedirs(ASSETS_PATH, exist_ok=True)
+        corpus_manager = PackedCorpusManager()
+    else:
+        validate_dataset(ASSETS_PATH)
+        corpus_manager = CorpusManager(path_to_raw_txt_data=ASSETS_PATH)
+    pipeline = TextProcessingPipeline(corpus_manager, batch_size=args.batch_size, workers=args.workers)
+    if args.morph_cache:
+        pipeline.morph_cache.load()
+    if args.incremental:
+        pipeline.manifest = ProcessingManifest()
+        pipeline.manifest.load()
+    pipeline.run()
+    if args.morph_cache:
+        pipeline.morph_cache.save()
 
 
 if __name__ == "__main__":
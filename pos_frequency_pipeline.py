@@ -2,7 +2,204 @@
 Implementation of POSFrequencyPipeline for score ten only.
 """
 
+import argparse
+import json
+import re
+
+import numpy as np
+
+from constants import ASSETS_PATH, META_STORE_PATH
+from dataset_layout import get_article_file_path
+from meta_store import open_meta_store
+from pipeline import CorpusManager, TextProcessingPipeline, TokenObserver, get_dataset_index, validate_dataset
+from visualizer import visualize_batch
+
+# the first mystem tag of a processed token word<tags>(pymorphy tags) is its part of speech
+POS_PATTERN = re.compile(r'<([A-Z]+)')
+# the same part of speech at the start of mystem tags of a token
+TOKEN_POS_PATTERN = re.compile(r'[A-Z]+')
+ROWS_BLOCK_SIZE = 10000
+# mystem parts of speech, tags met in texts but missing here get their own columns
+POS_TAGS = ('A', 'ADV', 'ADVPRO', 'ANUM', 'APRO', 'COM', 'CONJ', 'INTJ', 'NUM', 'PART', 'PR', 'S', 'SPRO', 'V')
+
+
+class POSFrequencies:
+    """
+    Matrix of part of speech counts: a row per article, a column per tag
+    """
+    def __init__(self, article_ids, tags, counts: np.ndarray):
+        self.article_ids = list(article_ids)
+        self.tags = list(tags)
+        self.counts = counts
+        self._rows = {article_id: row for row, article_id in enumerate(self.article_ids)}
+
+    def get_frequencies(self, article_id) -> dict:
+        """
+        Returns counts of tags met in the article
+        """
+        row = self.counts[self._rows[article_id]]
+        return {self.tags[column]: int(row[column]) for column in np.flatnonzero(row)}
+
+    def iter_frequencies(self):
+        """
+        Yields article id and counts of tags met in the article for each article
+        """
+        # rows are converted to Python numbers by blocks to keep memory flat on large corpora
+        for start in range(0, len(self.article_ids), ROWS_BLOCK_SIZE):
+            rows = self.counts[start:start + ROWS_BLOCK_SIZE].tolist()
+            for article_id, row in zip(self.article_ids[start:start + ROWS_BLOCK_SIZE], rows):
+                yield article_id, {tag: count for tag, count in zip(self.tags, row) if count}
+
+    def get_totals(self) -> dict:
+        """
+        Returns counts of tags in the whole corpus
+        """
+        totals = self.counts.sum(axis=0)
+        return {self.tags[column]: int(totals[column]) for column in np.flatnonzero(totals)}
+
+    def get_distributions(self) -> np.ndarray:
+        """
+        Returns share of each tag in each article, rows of articles without tags are zeros
+        """
+        sizes = self.counts.sum(axis=1, keepdims=True)
+        return np.divide(self.counts, sizes, out=np.zeros(self.counts.shape), where=sizes > 0)
+
+    def get_corpus_distribution(self) -> dict:
+        """
+        Returns share of each tag in the whole corpus
+        """
+        totals = self.get_totals()
+        size = sum(totals.values())
+        return {tag: count / size for tag, count in totals.items()}
+
+
+def count_pos_tags(article_ids: list, texts) -> POSFrequencies:
+    """
+    Counts parts of speech in processed texts given in the order of article ids
+    """
+    columns = {tag: column for column, tag in enumerate(POS_TAGS)}
+    rows = (_count_tags(POS_PATTERN.findall(text), columns) for text in texts)
+    return _build_frequencies(article_ids, rows, columns)
+
+
+def _count_tags(tags, columns: dict) -> np.ndarray:
+    """
+    Counts tags by their columns with a single bincount, tags met for the first time get new columns
+    """
+    indices = np.fromiter((columns.setdefault(tag, len(columns)) for tag in tags), dtype=np.intp)
+    return np.bincount(indices, minlength=len(columns))
+
+
+def _build_frequencies(article_ids: list, rows, columns: dict) -> POSFrequencies:
+    """
+    Fills the matrix with rows of counts given in the order of article ids,
+    a row may be shorter than the others if new tags were met after it was counted
+    """
+    counts = np.zeros((len(article_ids), len(columns)), dtype=np.int64)
+    for row, row_counts in enumerate(rows):
+        if len(row_counts) > counts.shape[1]:
+            # new tags are rare, so columns are added with a reserve and the matrix is seldom copied
+            reserve = max(len(row_counts), 2 * counts.shape[1]) - counts.shape[1]
+            counts = np.hstack((counts, np.zeros((len(article_ids), reserve), dtype=counts.dtype)))
+        counts[row, :len(row_counts)] = row_counts
+    return POSFrequencies(article_ids, columns, counts[:, :len(columns)])
+
+
+class POSFrequencyObserver(TokenObserver):
+    """
+    Counts parts of speech of tokens while TextProcessingPipeline processes articles
+    """
+    def __init__(self):
+        self._columns = {tag: column for column, tag in enumerate(POS_TAGS)}
+        self._rows = {}
+
+    def observe(self, article_id: int, tokens):
+        matches = map(TOKEN_POS_PATTERN.match, (token.mystem_tags for token in tokens))
+        row_counts = _count_tags((match.group() for match in matches if match), self._columns)
+        # parts of a long article are added up, columns only grow, so earlier counts are not longer
+        previous = self._rows.get(article_id)
+        if previous is not None:
+            row_counts[:len(previous)] += previous
+        self._rows[article_id] = row_counts
+
+    def get_pos_frequencies(self) -> POSFrequencies:
+        """
+        Returns counts of all observed articles in the order of their ids
+        """
+        article_ids = sorted(self._rows)
+        return _build_frequencies(article_ids, map(self._rows.get, article_ids), self._columns)
+
 
 class POSFrequencyPipeline:
-    def __init__(self, assets):
-        pass
+    """
+    Counts parts of speech in processed articles, saves them to meta files and visualizes them
+    """
+    def __init__(self, corpus_manager: CorpusManager):
+        self.corpus_manager = corpus_manager
+        # counts collected by POSFrequencyObserver, processed texts are read when they are not given
+        self.pos_frequencies = None
+        # number of processes rendering images, all CPUs by default
+        self.workers = None
+        # MetaStore that receives frequencies as appended updates instead of rewritten meta files
+        self.meta_store = None
+
+    def run(self):
+        """
+        Runs pipeline process scenario
+        """
+        pos_frequencies = self.pos_frequencies
+        if pos_frequencies is None:
+            articles = self.corpus_manager.get_articles()
+            # texts may have been processed after the corpus manager indexed the dataset
+            dataset_index = get_dataset_index(self.corpus_manager.path_to_raw_txt_data)
+            article_ids = [article_id for article_id in dataset_index.get_ids('processed') if article_id in articles]
+            pos_frequencies = count_pos_tags(article_ids, (articles[article_id].get_processed_text()
+                                                           for article_id in article_ids))
+        self._save_frequencies(pos_frequencies)
+        visualize_batch(((frequencies, self._get_path(article_id, 'image.png'))
+                         for article_id, frequencies in pos_frequencies.iter_frequencies() if frequencies),
+                        workers=self.workers)
+
+    def _save_frequencies(self, pos_frequencies: POSFrequencies):
+        """
+        Adds frequencies to meta files or to the meta store of all counted articles
+        """
+        for article_id, frequencies in pos_frequencies.iter_frequencies():
+            if self.meta_store is not None:
+                self.meta_store.update(article_id, {'pos_frequencies': frequencies})
+                continue
+            with open(self._get_path(article_id, 'meta.json'), encoding='utf-8') as file:
+                meta = json.load(file)
+            meta['pos_frequencies'] = frequencies
+            with open(self._get_path(article_id, 'meta.json'), 'w', encoding='utf-8') as file:
+                json.dump(meta, file, sort_keys=False, indent=4, ensure_ascii=False, separators=(',', ': '))
+
+    def _get_path(self, article_id, kind: str) -> str:
+        return get_article_file_path(self.corpus_manager.path_to_raw_txt_data, article_id, kind,
+                                     self.corpus_manager.dataset_index.sharded)
+
+
+def main():
+    arg_parser = argparse.ArgumentParser(description='Counts parts of speech in processed articles')
+    arg_parser.add_argument('--with-processing', action='store_true',
+                            help='process raw texts first and count parts of speech in the same pass')
+    args = arg_parser.parse_args()
+
+    validate_dataset(ASSETS_PATH)
+    corpus_manager = CorpusManager(path_to_raw_txt_data=ASSETS_PATH)
+    pipeline = POSFrequencyPipeline(corpus_manager=corpus_manager)
+    if args.with_processing:
+        observer = POSFrequencyObserver()
+        text_processing_pipeline = TextProcessingPipeline(corpus_manager)
+        text_processing_pipeline.observers.append(observer)
+        text_processing_pipeline.run()
+        pipeline.pos_frequencies = observer.get_pos_frequencies()
+    if corpus_manager.dataset_index.meta_stored:
+        pipeline.meta_store = open_meta_store(META_STORE_PATH)
+    pipeline.run()
+    if pipeline.meta_store is not None:
+        pipeline.meta_store.close()
+
+
+if __name__ == "__main__":
+    main()
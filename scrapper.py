@@ -1,6 +1,61 @@
 """
 Crawler implementation
 """
+import argparse
+import asyncio
+import datetime
+import hashlib
+import json
+import logging
+import os
+import random
+import re
+import shutil
+import sqlite3
+import threading
+import time
+import weakref
+from collections import namedtuple
+from concurrent.futures import BrokenExecutor, Future, ProcessPoolExecutor, ThreadPoolExecutor
+from functools import lru_cache, partial
+from urllib.parse import urljoin, urlparse, urlsplit, urlunsplit
+from urllib.robotparser import RobotFileParser
+
+import requests
+from bs4 import BeautifulSoup, FeatureNotFound
+from requests.adapters import HTTPAdapter
+from urllib3.util.request import ACCEPT_ENCODING
+
+from article import Article
+from constants import ASSETS_PATH, CACHE_PATH, CHECKPOINT_PATH, CRAWLER_CONFIG_PATH, FRONTIER_PATH, \
+    META_STORE_PATH
+from meta_store import import_meta_files, open_meta_store, uses_meta_store
+from url_frontier import BloomFilter, UrlFrontier, normalize_url
+
+MAX_ARTICLES = 100000
+MAX_CONCURRENCY = 10
+MAX_CONCURRENCY_PER_HOST = 4
+REQUEST_TIMEOUT = 30
+POOL_SIZE = MAX_CONCURRENCY
+CACHE_MAX_AGE = 30 * 24 * 60 * 60
+CACHE_MAX_SIZE = 1024 * 1024 * 1024
+MAX_CRAWL_DEPTH = 10
+MAX_CRAWL_PAGES = 1000000
+CHECKPOINT_INTERVAL = 60
+PARSE_QUEUE_SIZE = 100
+DEFAULT_HOST_RATE = 5.0
+DEFAULT_HOST_BURST = 5
+BACKOFF_BASE = 1.0
+MAX_BACKOFF = 300.0
+MAX_RETRIES = 5
+RETRY_STATUSES = (429, 500, 502, 503, 504)
+HTML_PARSERS = ('lxml', 'html.parser')
+DEFAULT_HTML_PARSER = 'html.parser'
+# article pages of most news sites have a date or a long numeric id in their path
+DEFAULT_ARTICLE_URL_PATTERN = r'/\d{4}/\d{1,2}/\d{1,2}/|/\d{5,}(?:[/.-]|$)'
+
+FetchedPage = namedtuple('FetchedPage', ['url', 'text', 'not_modified'])
+LOGGER = logging.getLogger(__name__)
 
 
 class IncorrectURLError(Exception):
@@ -27,36 +82,584 @@ class UnknownConfigError(Exception):
     """
 
 
+@lru_cache(maxsize=None)
+def get_session(pool_size: int = POOL_SIZE) -> requests.Session:
+    """
+    Returns a shared session that keeps connections alive and reuses them between requests
+    """
+    session = requests.Session()
+    # pool_block keeps the number of open connections per host bounded by pool_size
+    adapter = HTTPAdapter(pool_connections=pool_size, pool_maxsize=pool_size, pool_block=True)
+    session.mount('http://', adapter)
+    session.mount('https://', adapter)
+    # urllib3 only advertises br when a brotli decoder is installed
+    session.headers.update({'Accept-Encoding': ACCEPT_ENCODING,
+                            'Connection': 'keep-alive'})
+    return session
+
+
+@lru_cache(maxsize=None)
+def get_html_parser(crawler_path: str = CRAWLER_CONFIG_PATH) -> str:
+    """
+    Returns BeautifulSoup parser chosen in the config, falls back to html.parser if it is not installed
+    """
+    with open(crawler_path, encoding='utf-8') as file:
+        name = json.load(file).get('html_parser', DEFAULT_HTML_PARSER)
+    try:
+        BeautifulSoup('', name)
+    except FeatureNotFound:
+        return DEFAULT_HTML_PARSER
+    return name
+
+
+@lru_cache(maxsize=None)
+def get_article_url_pattern(crawler_path: str = CRAWLER_CONFIG_PATH):
+    """
+    Returns compiled regular expression of article URLs chosen in the config
+    """
+    with open(crawler_path, encoding='utf-8') as file:
+        return re.compile(json.load(file).get('article_url_pattern', DEFAULT_ARTICLE_URL_PATTERN))
+
+
+def make_soup(html: str) -> BeautifulSoup:
+    """
+    Builds BeautifulSoup tree with the configured parser
+    """
+    return BeautifulSoup(html, get_html_parser())
+
+
+class ResponseCache:
+    """
+    On-disk cache of downloaded pages keyed by URL, keeps validators for conditional requests
+    """
+    def __init__(self, path: str = CACHE_PATH, max_age: int = CACHE_MAX_AGE, max_size: int = CACHE_MAX_SIZE):
+        self.path = path
+        self.max_age = max_age
+        self.max_size = max_size
+        os.makedirs(path, exist_ok=True)
+
+    def _entry_path(self, url):
+        return os.path.join(self.path, hashlib.sha1(url.encode('utf-8')).hexdigest() + '.json')
+
+    def _write(self, url, entry):
+        tmp_path = self._entry_path(url) + '.tmp'
+        with open(tmp_path, 'w', encoding='utf-8') as file:
+            json.dump(entry, file, ensure_ascii=False)
+        os.replace(tmp_path, self._entry_path(url))
+
+    def get(self, url):
+        """
+        Returns cached entry for the url or None if there is no fresh entry
+        """
+        try:
+            with open(self._entry_path(url), encoding='utf-8') as file:
+                entry = json.load(file)
+        except (OSError, ValueError):
+            return None
+        if entry.get('url') != url or time.time() - entry['stored_at'] > self.max_age:
+            return None
+        return entry
+
+    def conditional_headers(self, url):
+        """
+        Returns If-None-Match/If-Modified-Since headers for the cached url
+        """
+        entry = self.get(url)
+        if entry is None:
+            return {}
+        headers = {}
+        if entry.get('etag'):
+            headers['If-None-Match'] = entry['etag']
+        if entry.get('last_modified'):
+            headers['If-Modified-Since'] = entry['last_modified']
+        return headers
+
+    def store(self, url, response):
+        """
+        Saves response body together with its validators
+        """
+        self._write(url, {'url': url,
+                          'etag': response.headers.get('ETag'),
+                          'last_modified': response.headers.get('Last-Modified'),
+                          'stored_at': time.time(),
+                          'text': response.text,
+                          'article': None})
+
+    def refresh(self, url, entry: dict):
+        """
+        Marks the entry as fresh after the server confirmed it is not modified
+        """
+        entry['stored_at'] = time.time()
+        self._write(url, entry)
+
+    def store_article(self, url, fields: dict):
+        """
+        Saves fields of the article parsed from the cached page
+        """
+        entry = self.get(url)
+        if entry is not None:
+            entry['article'] = fields
+            self._write(url, entry)
+
+    def evict(self):
+        """
+        Removes entries older than max_age, then the oldest ones until the cache fits max_size
+        """
+        entries = []
+        for file in os.scandir(self.path):
+            if not file.name.endswith('.json'):
+                continue
+            stat = file.stat()
+            if time.time() - stat.st_mtime > self.max_age:
+                os.remove(file.path)
+            else:
+                entries.append((stat.st_mtime, stat.st_size, file.path))
+
+        total_size = sum(size for _, size, _ in entries)
+        for _, size, path in sorted(entries):
+            if total_size <= self.max_size:
+                break
+            os.remove(path)
+            total_size -= size
+
+
+def fetch_page(url: str, session: requests.Session = None, cache: ResponseCache = None):
+    """
+    Downloads a page, revalidating the cached copy if there is one.
+    Raises requests.HTTPError if the page can not be downloaded
+    """
+    session = session or get_session()
+    headers = cache.conditional_headers(url) if cache else {}
+    response = session.get(url, headers=headers, timeout=REQUEST_TIMEOUT)
+    if response.status_code == 304 and cache:
+        entry = cache.get(url)
+        if entry is not None:
+            # revalidated entries do not expire and are not evicted as the least recently used ones
+            cache.refresh(url, entry)
+            return FetchedPage(url, entry['text'], True)
+        response = session.get(url, timeout=REQUEST_TIMEOUT)
+    response.raise_for_status()
+    if cache:
+        cache.store(url, response)
+    return FetchedPage(url, response.text, False)
+
+
+class HostScheduler:
+    """
+    Keeps request rate to each host polite: a token bucket per host, robots.txt rules and Crawl-delay,
+    exponential backoff with jitter on throttling responses and gradual recovery after them.
+    Hosts with Crawl-delay get no bursts, their requests are always at least the delay apart
+    """
+    def __init__(self, rate: float = DEFAULT_HOST_RATE, burst: int = DEFAULT_HOST_BURST,
+                 session: requests.Session = None):
+        self.rate = rate
+        self.burst = burst
+        self.session = session or get_session()
+        self.backoff_base = BACKOFF_BASE
+        self._hosts = {}
+        # future of parsed robots.txt per host, so that a slow host does not hold up loading of the others
+        self._robots = {}
+        self._robots_lock = threading.Lock()
+
+    def _load_robots(self, url):
+        netloc = urlsplit(url).netloc
+        with self._robots_lock:
+            future = self._robots.get(netloc)
+            loading = future is None
+            if loading:
+                future = self._robots[netloc] = Future()
+        if loading:
+            try:
+                future.set_result(self._fetch_robots(url))
+            except BaseException as error:
+                future.set_exception(error)
+                raise
+        return future.result()
+
+    def _fetch_robots(self, url):
+        parts = urlsplit(url)
+        robots_url = urlunsplit((parts.scheme, parts.netloc, '/robots.txt', '', ''))
+        robots = RobotFileParser(robots_url)
+        try:
+            response = self.session.get(robots_url, timeout=REQUEST_TIMEOUT)
+            robots.parse(response.text.splitlines() if response.ok else [])
+        except requests.RequestException:
+            robots.parse([])
+        return robots
+
+    def _get_host(self, url, robots):
+        host = urlsplit(url).netloc
+        if host not in self._hosts:
+            crawl_delay = robots.crawl_delay(self.session.headers['User-Agent'])
+            max_rate = min(self.rate, 1 / float(crawl_delay)) if crawl_delay else self.rate
+            # tokens saved up while the host was idle would send requests back-to-back despite Crawl-delay
+            self._hosts[host] = {'max_rate': max_rate, 'rate': max_rate, 'burst': 1 if crawl_delay else self.burst,
+                                 'tokens': 1.0, 'updated_at': time.monotonic(), 'blocked_until': 0.0, 'failures': 0}
+        return self._hosts[host]
+
+    async def acquire(self, url):
+        """
+        Waits until a request to the url host is allowed, returns False if robots.txt forbids the url
+        """
+        loop = asyncio.get_running_loop()
+        robots = await loop.run_in_executor(None, self._load_robots, url)
+        if not robots.can_fetch(self.session.headers['User-Agent'], url):
+            return False
+        host = self._get_host(url, robots)
+        while True:
+            now = time.monotonic()
+            host['tokens'] = min(host['burst'], host['tokens'] + (now - host['updated_at']) * host['rate'])
+            host['updated_at'] = now
+            if now >= host['blocked_until'] and host['tokens'] >= 1:
+                host['tokens'] -= 1
+                return True
+            await asyncio.sleep(max(host['blocked_until'] - now, (1 - host['tokens']) / host['rate']))
+
+    def report(self, url, status_code: int, retry_after: str = None):
+        """
+        Adapts host rate to the response: backs off on 429/5xx, speeds up again on success
+        """
+        host = self._hosts.get(urlsplit(url).netloc)
+        if host is None:
+            return
+        if status_code == 429 or status_code >= 500:
+            host['failures'] += 1
+            delay = min(MAX_BACKOFF, self.backoff_base * 2 ** (host['failures'] - 1))
+            delay *= random.uniform(0.5, 1.5)
+            if retry_after and retry_after.isdigit():
+                delay = max(delay, float(retry_after))
+            host['blocked_until'] = time.monotonic() + delay
+            host['rate'] = max(host['max_rate'] / 2 ** 6, host['rate'] / 2)
+            host['tokens'] = 0.0
+            host['updated_at'] = time.monotonic()
+        elif status_code < 400:
+            host['failures'] = 0
+            host['rate'] = min(host['max_rate'], host['rate'] + host['max_rate'] / 10)
+
+
+async def as_async_iterable(iterable):
+    """
+    Turns plain iterable into an asynchronous one, asynchronous iterables are passed through
+    """
+    if hasattr(iterable, '__aiter__'):
+        async for item in iterable:
+            yield item
+    else:
+        for item in iterable:
+            yield item
+
+
+class AsyncFetcher:
+    """
+    Downloads pages concurrently with a global and a per-host concurrency limit
+    """
+    def __init__(self, max_concurrency: int = MAX_CONCURRENCY,
+                 max_per_host: int = MAX_CONCURRENCY_PER_HOST,
+                 session: requests.Session = None, cache: ResponseCache = None):
+        self.max_concurrency = max_concurrency
+        self.max_per_host = max_per_host
+        self.session = session or get_session()
+        self.cache = cache
+        self.scheduler = None
+        # the thread pool size is the global concurrency limit, it is shared by all running downloads
+        self._executor = ThreadPoolExecutor(max_workers=max_concurrency)
+        self._host_limits = weakref.WeakKeyDictionary()
+
+    async def _fetch(self, url):
+        """
+        Downloads a single page, returns None if download failed.
+        Throttled pages are retried only when a scheduler is set to delay the retries
+        """
+        for attempt in range(MAX_RETRIES + 1):
+            if self.scheduler and not await self.scheduler.acquire(url):
+                return None
+            try:
+                page = await self._fetch_once(url)
+            except requests.HTTPError as error:
+                if self.scheduler:
+                    self.scheduler.report(url, error.response.status_code,
+                                          error.response.headers.get('Retry-After'))
+                if not self.scheduler or error.response.status_code not in RETRY_STATUSES \
+                        or attempt == MAX_RETRIES:
+                    return None
+            except requests.RequestException:
+                return None
+            else:
+                if self.scheduler:
+                    self.scheduler.report(url, 200)
+                return page
+        return None
+
+    async def _fetch_once(self, url):
+        loop = asyncio.get_running_loop()
+        # semaphores belong to the event loop they were created in
+        host_limits = self._host_limits.setdefault(loop, {})
+        host = urlparse(url).netloc
+        if host not in host_limits:
+            host_limits[host] = asyncio.Semaphore(self.max_per_host)
+        async with host_limits[host]:
+            return await loop.run_in_executor(self._executor, partial(fetch_page, url, self.session, self.cache))
+
+    async def iter_pages(self, urls):
+        """
+        Yields FetchedPage instances in the order downloads finish.
+        urls can be a plain or an asynchronous iterable, it is consumed lazily
+        """
+        urls = as_async_iterable(urls)
+        pending = set()
+        next_url = None
+        try:
+            while True:
+                # new downloads start only when the consumer has taken finished pages
+                if next_url is None and urls is not None and len(pending) < 2 * self.max_concurrency:
+                    next_url = asyncio.ensure_future(urls.__anext__())
+                waiting = pending | {next_url} if next_url else pending
+                if not waiting:
+                    return
+                done, _ = await asyncio.wait(waiting, return_when=asyncio.FIRST_COMPLETED)
+                if next_url in done:
+                    try:
+                        pending.add(asyncio.ensure_future(self._fetch(next_url.result())))
+                    except StopAsyncIteration:
+                        urls = None
+                    next_url = None
+                for task in done & pending:
+                    pending.discard(task)
+                    if task.result() is not None:
+                        yield task.result()
+        finally:
+            for task in pending | {next_url} if next_url else pending:
+                task.cancel()
+
+    def download(self, urls, on_page):
+        """
+        Downloads all urls and calls on_page(page) as soon as each page is ready
+        """
+        async def consume():
+            async for page in self.iter_pages(urls):
+                on_page(page)
+
+        asyncio.run(consume())
+
+
 class Crawler:
     """
     Crawler implementation
     """
-    def __init__(self, seed_urls: list, max_articles: int):
-        pass
+    def __init__(self, seed_urls: list, max_articles: int, max_articles_per_seed: int = None,
+                 fetcher: AsyncFetcher = None):
+        self.seed_urls = seed_urls
+        self.max_articles = max_articles
+        self.max_articles_per_seed = max_articles_per_seed or max_articles
+        self.fetcher = fetcher or AsyncFetcher()
+        self.urls = []
+        self.known_urls = set()
+        self.checkpoint = None
 
     @staticmethod
     def _extract_url(article_bs):
-        pass
+        return [link['href'] for link in article_bs.find_all('a', href=True)]
+
+    async def iter_articles(self):
+        """
+        Yields article URLs as soon as they are found, stops when max_articles are found.
+        URLs found before, for example restored from a checkpoint, are yielded first
+        """
+        for url in self.urls:
+            if url not in self.known_urls:
+                yield url
+        async for url in self._find_new_articles():
+            yield url
+        if self.checkpoint:
+            self.checkpoint.save(self, crawl_done=True)
+
+    async def _find_new_articles(self):
+        seen = set(self.urls) | self.known_urls
+        seed_pages = self.fetcher.iter_pages(self.seed_urls)
+        try:
+            async for seed_page in seed_pages:
+                found = 0
+                for href in self._extract_url(make_soup(seed_page.text)):
+                    if len(self.urls) >= self.max_articles:
+                        return
+                    if found >= self.max_articles_per_seed:
+                        break
+                    url = urljoin(seed_page.url, href)
+                    if url not in seen:
+                        seen.add(url)
+                        self.urls.append(url)
+                        found += 1
+                        yield url
+                if self.checkpoint:
+                    self.checkpoint.maybe_save(self)
+        finally:
+            await seed_pages.aclose()
 
     def find_articles(self):
         """
         Finds articles
         """
-        pass
+        async def collect():
+            async for _ in self.iter_articles():
+                pass
+
+        asyncio.run(collect())
 
     def get_search_urls(self):
         """
         Returns seed_urls param
         """
-        pass
+        return self.seed_urls
+
+
+class CrawlerRecursive(Crawler):
+    """
+    Crawler that starts from the seeds and visits every page of the website.
+    Article pages are told by article_url_pattern, subclasses may override _is_article_url instead.
+    Each crawler needs its own frontier_path, the file is emptied when the crawler is created
+    """
+    article_url_pattern = re.compile(DEFAULT_ARTICLE_URL_PATTERN)
+
+    def __init__(self, seed_urls: list, max_articles: int, max_articles_per_seed: int = None,
+                 fetcher: AsyncFetcher = None, frontier_path: str = FRONTIER_PATH):
+        super().__init__(seed_urls, max_articles, max_articles_per_seed, fetcher)
+        self.max_depth = MAX_CRAWL_DEPTH
+        self.max_pages = MAX_CRAWL_PAGES
+        self.visited_pages = 0
+        self.seen = BloomFilter()
+        self.frontier = UrlFrontier(frontier_path)
+        for url in seed_urls:
+            self._enqueue(0, normalize_url(url))
+
+    def _is_article_url(self, url):
+        """
+        Tells whether the url is an article page of the website rather than a section or listing page
+        """
+        return bool(self.article_url_pattern.search(urlsplit(url).path))
+
+    def _enqueue(self, depth, url):
+        self.seen.add(url)
+        self.frontier.push(depth, url)
+
+    def _visit(self, depths, page):
+        depth = depths[page.url]
+        for href in self._extract_url(make_soup(page.text)):
+            try:
+                url = normalize_url(urljoin(page.url, href))
+            except ValueError:
+                # malformed link, for example with a wrong port or an unclosed IPv6 address
+                continue
+            if urlsplit(url).netloc != urlsplit(page.url).netloc or url in self.seen \
+                    or url in self.known_urls:
+                continue
+            if self._is_article_url(url) and len(self.urls) < self.max_articles:
+                self.urls.append(url)
+            if depth < self.max_depth:
+                self._enqueue(depth + 1, url)
+            else:
+                self.seen.add(url)
+
+    async def _find_new_articles(self):
+        """
+        Visits website pages in breadth-first order until article or page budget is exhausted
+        """
+        while self.frontier and self.visited_pages < self.max_pages and len(self.urls) < self.max_articles:
+            batch_size = min(self.fetcher.max_concurrency, self.max_pages - self.visited_pages)
+            batch = {}
+            while self.frontier and len(batch) < batch_size:
+                depth, url = self.frontier.pop()
+                batch[url] = depth
+            self.visited_pages += len(batch)
+            async for page in self.fetcher.iter_pages(batch):
+                found = len(self.urls)
+                self._visit(batch, page)
+                for url in self.urls[found:]:
+                    yield url
+            if self.checkpoint:
+                self.checkpoint.maybe_save(self)
+
+
+class CrawlCheckpoint:
+    """
+    Stores crawl state in SQLite so that an interrupted crawl continues where it stopped
+    """
+    def __init__(self, path: str = CHECKPOINT_PATH, interval: float = CHECKPOINT_INTERVAL):
+        self.path = path
+        self.interval = interval
+        self._saved_at = time.monotonic()
+        os.makedirs(os.path.dirname(path), exist_ok=True)
+        self.connection = sqlite3.connect(path)
+        with self.connection:
+            self.connection.execute('CREATE TABLE IF NOT EXISTS state (key TEXT PRIMARY KEY, value)')
+            self.connection.execute('CREATE TABLE IF NOT EXISTS frontier (depth INTEGER, url TEXT)')
+            self.connection.execute('CREATE TABLE IF NOT EXISTS urls (url TEXT)')
+
+    def _get_state(self, key):
+        row = self.connection.execute('SELECT value FROM state WHERE key = ?', (key,)).fetchone()
+        return row[0] if row else None
+
+    @property
+    def crawl_done(self):
+        """
+        Tells whether article URLs were all found before the crawl stopped
+        """
+        return bool(self._get_state('crawl_done'))
+
+    def clear(self):
+        """
+        Forgets saved state
+        """
+        with self.connection:
+            for table in ('state', 'frontier', 'urls'):
+                self.connection.execute('DELETE FROM {}'.format(table))
+
+    def save(self, crawler, crawl_done: bool = False):
+        """
+        Saves found article URLs and, for recursive crawler, its frontier and seen set
+        """
+        with self.connection:
+            self.connection.execute('DELETE FROM urls')
+            self.connection.executemany('INSERT INTO urls VALUES (?)', ((url,) for url in crawler.urls))
+            state = {'crawl_done': crawl_done}
+            if isinstance(crawler, CrawlerRecursive):
+                self.connection.execute('DELETE FROM frontier')
+                self.connection.executemany('INSERT INTO frontier VALUES (?, ?)', iter(crawler.frontier))
+                state.update({'visited_pages': crawler.visited_pages, 'seen': bytes(crawler.seen.bits)})
+            self.connection.executemany('INSERT OR REPLACE INTO state VALUES (?, ?)', state.items())
+        self._saved_at = time.monotonic()
+
+    def maybe_save(self, crawler):
+        """
+        Saves crawler state if interval has passed since the last save
+        """
+        if time.monotonic() - self._saved_at >= self.interval:
+            self.save(crawler)
+
+    def restore(self, crawler):
+        """
+        Fills crawler with saved state, returns False if there is nothing to restore
+        """
+        if self._get_state('crawl_done') is None:
+            return False
+        crawler.urls = [url for url, in self.connection.execute('SELECT url FROM urls ORDER BY rowid')]
+        if isinstance(crawler, CrawlerRecursive):
+            crawler.visited_pages = self._get_state('visited_pages')
+            crawler.seen.bits[:] = self._get_state('seen')
+            crawler.frontier = UrlFrontier(crawler.frontier.spill_path, crawler.frontier.max_in_memory)
+            for depth, url in self.connection.execute('SELECT depth, url FROM frontier ORDER BY rowid'):
+                crawler.frontier.push(depth, url)
+        return True
 
 
 class ArticleParser:
     """
     ArticleParser implementation
     """
-    def __init__(self, full_url: str, article_id: int):
-        pass
+    def __init__(self, full_url: str, article_id: int, cache: ResponseCache = None):
+        self.full_url = full_url
+        self.article_id = article_id
+        self.cache = cache
+        self.article = Article(full_url, article_id)
 
     def _fill_article_with_text(self, article_soup):
         pass
@@ -71,27 +674,242 @@ class ArticleParser:
         """
         pass
 
-    def parse(self):
+    def fill_from_fields(self, fields: dict):
         """
-        Parses each article
+        Fills article with fields parsed earlier
         """
-        pass
+        self.article.title = fields['title']
+        self.article.author = fields['author']
+        self.article.topics = fields['topics']
+        self.article.text = fields['text']
+        if fields['date']:
+            self.article.date = datetime.datetime.fromisoformat(fields['date'])
+
+    def get_fields(self):
+        """
+        Returns parsed article fields in a serializable form
+        """
+        return {'title': self.article.title,
+                'author': self.article.author,
+                'topics': self.article.topics,
+                'text': self.article.text,
+                'date': self.article.date.isoformat() if self.article.date else None}
+
+    def parse(self, page: FetchedPage = None):
+        """
+        Parses each article, downloads the page unless it is already given.
+        Pages that were not modified since the last crawl are not parsed again
+        """
+        if page is None:
+            page = fetch_page(self.full_url, cache=self.cache)
+        if page.not_modified and self.cache:
+            entry = self.cache.get(self.full_url)
+            if entry is not None and entry['article'] is not None:
+                self.fill_from_fields(entry['article'])
+                return self.article
+
+        article_bs = make_soup(page.text)
+        self._fill_article_with_text(article_bs)
+        self._fill_article_with_meta_information(article_bs)
+        if self.cache:
+            self.cache.store_article(self.full_url, self.get_fields())
+        return self.article
+
+
+def parse_page_fields(page: FetchedPage, cache: ResponseCache = None, parser_class=ArticleParser):
+    """
+    Parses downloaded article page, returns article fields
+    """
+    parser = parser_class(page.url, None, cache)
+    parser.parse(page)
+    return parser.get_fields()
+
+
+def parse_articles_in_processes(urls, fetcher: AsyncFetcher, first_id: int = 1, workers: int = None,
+                                parser_class=ArticleParser):
+    """
+    Downloads articles and parses them in a pool of processes, saves each one as soon as it is parsed.
+    Downloading pauses while PARSE_QUEUE_SIZE pages are waiting for parsing.
+    A page that fails to parse is logged and skipped without taking an article id
+    """
+    saved = []
+
+    def save(url, fields):
+        parser = parser_class(url, first_id + len(saved), fetcher.cache)
+        parser.fill_from_fields(fields)
+        parser.article.save_raw()
+        saved.append(parser.article)
+
+    async def run(executor):
+        loop = asyncio.get_running_loop()
+        queue_slots = asyncio.Semaphore(PARSE_QUEUE_SIZE)
+        parsing = set()
 
+        async def parse(page):
+            try:
+                fields = await loop.run_in_executor(executor, parse_page_fields,
+                                                    page, fetcher.cache, parser_class)
+            except BrokenExecutor:
+                raise
+            except Exception:  # any error of a parser means the page has unexpected structure
+                LOGGER.exception('Failed to parse %s, the page is skipped', page.url)
+                return
+            finally:
+                queue_slots.release()
+            save(page.url, fields)
 
-def prepare_environment(base_path):
+        async for page in fetcher.iter_pages(urls):
+            await queue_slots.acquire()
+            parsing.add(asyncio.ensure_future(parse(page)))
+            # finished tasks are awaited here, so that errors of saving are raised rather than lost
+            done = {task for task in parsing if task.done()}
+            parsing -= done
+            for task in done:
+                task.result()
+        await asyncio.gather(*parsing)
+
+    with ProcessPoolExecutor(max_workers=workers) as executor:
+        asyncio.run(run(executor))
+    return saved
+
+
+def prepare_environment(base_path, incremental: bool = False):
+    """
+    Creates ASSETS_PATH folder if not created and removes existing folder.
+    In incremental mode existing folder is kept
+    """
+    if os.path.exists(base_path) and not incremental:
+        shutil.rmtree(base_path)
+    os.makedirs(base_path, exist_ok=True)
+
+
+def build_url_index(base_path):
+    """
+    Maps URL of each already collected article to its id,
+    read from the meta store if the dataset keeps meta data there, otherwise from meta files
+    """
+    if uses_meta_store(base_path):
+        # the store is read once, the last URL written for an article wins as it does when records are merged
+        urls = {record['id']: record['url'] for record in open_meta_store(META_STORE_PATH).iter_records()
+                if 'url' in record}
+        return {url: article_id for article_id, url in urls.items()}
+    index = {}
+    # walks subfolders as well, so that both flat and sharded layouts are indexed
+    for folder, _, file_names in os.walk(base_path):
+        for file_name in file_names:
+            if not file_name.endswith('_meta.json'):
+                continue
+            with open(os.path.join(folder, file_name), encoding='utf-8') as meta_file:
+                meta = json.load(meta_file)
+            index[meta['url']] = meta['id']
+    return index
+
+
+def resume_crawl(crawler: Crawler, checkpoint: CrawlCheckpoint, url_index: dict):
     """
-    Creates ASSETS_PATH folder if not created and removes existing folder
+    Continues the crawl interrupted after the articles of url_index were saved.
+    These articles count against max_articles of the crawler and are not returned again.
+    Returns URLs of articles that are left to parse
     """
-    pass
+    crawler.known_urls = set(url_index)
+    crawler.max_articles = max(crawler.max_articles - len(url_index), 0)
+    crawl_done = checkpoint.restore(crawler) and checkpoint.crawl_done
+    # found URLs saved to the checkpoint are parsed only once, so the cap counts the rest of them only
+    crawler.urls = [url for url in crawler.urls if url not in url_index]
+    if crawl_done:
+        return list(crawler.urls)
+    return crawler.iter_articles()
 
 
 def validate_config(crawler_path):
     """
     Validates given config
     """
-    pass
+    with open(crawler_path, encoding='utf-8') as file:
+        config = json.load(file)
+
+    if not isinstance(config, dict) or 'base_urls' not in config \
+            or 'total_articles_to_find_and_parse' not in config:
+        raise UnknownConfigError
+
+    seed_urls = config['base_urls']
+    if not isinstance(seed_urls, list) or not all(isinstance(url, str) and re.match(r'https?://', url)
+                                                  for url in seed_urls):
+        raise IncorrectURLError
+
+    max_articles = config['total_articles_to_find_and_parse']
+    if not isinstance(max_articles, int) or isinstance(max_articles, bool) or max_articles < 0:
+        raise IncorrectNumberOfArticlesError
+    if max_articles > MAX_ARTICLES:
+        raise NumberOfArticlesOutOfRangeError
+
+    max_articles_per_seed = config.get('max_number_articles_to_get_from_one_seed', max_articles)
+    if not isinstance(max_articles_per_seed, int) or isinstance(max_articles_per_seed, bool):
+        raise UnknownConfigError
+
+    if config.get('html_parser', DEFAULT_HTML_PARSER) not in HTML_PARSERS:
+        raise UnknownConfigError
+
+    article_url_pattern = config.get('article_url_pattern', DEFAULT_ARTICLE_URL_PATTERN)
+    if not isinstance(article_url_pattern, str):
+        raise UnknownConfigError
+    try:
+        re.compile(article_url_pattern)
+    except re.error as error:
+        raise UnknownConfigError from error
+
+    return seed_urls, max_articles, max_articles_per_seed
 
 
 if __name__ == '__main__':
-    # YOUR CODE HERE
-    pass
+    ARG_PARSER = argparse.ArgumentParser(description='Collects articles from the configured seeds')
+    ARG_PARSER.add_argument('--incremental', action='store_true',
+                            help='keep collected articles and download only new ones')
+    ARG_PARSER.add_argument('--resume', action='store_true',
+                            help='continue interrupted crawl from the last checkpoint, '
+                                 'articles collected before it stopped count against the configured number')
+    ARG_PARSER.add_argument('--recursive', action='store_true',
+                            help='visit every page of the website starting from the seeds, '
+                                 'article pages are told by article_url_pattern of the config')
+    ARG_PARSER.add_argument('--meta-store', action='store_true',
+                            help='keep meta data of articles in a single file instead of N_meta.json files, '
+                                 'the dataset keeps it there in later runs as well')
+    ARGS = ARG_PARSER.parse_args()
+
+    SEED_URLS, MAX_ARTICLES_TO_PARSE, MAX_ARTICLES_PER_SEED = validate_config(CRAWLER_CONFIG_PATH)
+    prepare_environment(ASSETS_PATH, incremental=ARGS.incremental or ARGS.resume)
+    # meta data of removed articles must not stay in the meta store
+    if os.path.exists(META_STORE_PATH) and not (ARGS.incremental or ARGS.resume):
+        os.remove(META_STORE_PATH)
+    # meta files of an already collected dataset are moved to the store once
+    if ARGS.meta_store and not uses_meta_store(ASSETS_PATH):
+        import_meta_files(ASSETS_PATH, META_STORE_PATH)
+    URL_INDEX = build_url_index(ASSETS_PATH)
+    # an incremental run keeps meta data where the dataset already keeps it
+    if uses_meta_store(ASSETS_PATH):
+        Article.meta_store = open_meta_store(META_STORE_PATH)
+    CHECKPOINT = CrawlCheckpoint(CHECKPOINT_PATH)
+    if not ARGS.resume:
+        CHECKPOINT.clear()
+
+    CACHE = ResponseCache(CACHE_PATH)
+    FETCHER = AsyncFetcher(max_concurrency=MAX_CONCURRENCY, max_per_host=MAX_CONCURRENCY_PER_HOST,
+                           session=get_session(POOL_SIZE), cache=CACHE)
+    FETCHER.scheduler = HostScheduler(session=FETCHER.session)
+    if ARGS.recursive:
+        CrawlerRecursive.article_url_pattern = get_article_url_pattern(CRAWLER_CONFIG_PATH)
+        CRAWLER = CrawlerRecursive(SEED_URLS, MAX_ARTICLES_TO_PARSE, MAX_ARTICLES_PER_SEED, FETCHER)
+    else:
+        CRAWLER = Crawler(SEED_URLS, MAX_ARTICLES_TO_PARSE, MAX_ARTICLES_PER_SEED, FETCHER)
+    CRAWLER.known_urls = set(URL_INDEX)
+    CRAWLER.checkpoint = CHECKPOINT
+    # articles saved before the crawl stopped are already in the dataset and keep their ids
+    if ARGS.resume:
+        ARTICLE_URLS = resume_crawl(CRAWLER, CHECKPOINT, URL_INDEX)
+    else:
+        ARTICLE_URLS = CRAWLER.iter_articles()
+    parse_articles_in_processes(ARTICLE_URLS, FETCHER, first_id=max(URL_INDEX.values(), default=0) + 1)
+    CHECKPOINT.clear()
+    CACHE.evict()
+    if Article.meta_store is not None:
+        Article.meta_store.close()
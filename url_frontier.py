@@ -0,0 +1,113 @@
+"""
+Structures of the recursive crawler: canonical URLs, set of seen URLs and queue of pages to visit
+"""
+import hashlib
+import math
+import os
+from collections import deque
+from urllib.parse import parse_qsl, urlencode, urlsplit, urlunsplit
+
+FRONTIER_MAX_IN_MEMORY = 10000
+BLOOM_CAPACITY = 10000000
+BLOOM_ERROR_RATE = 0.001
+DEFAULT_PORTS = {'http': 80, 'https': 443}
+
+
+def normalize_url(url: str) -> str:
+    """
+    Brings URL to a canonical form so that the same page is not visited twice
+    """
+    parts = urlsplit(url)
+    scheme = parts.scheme.lower()
+    host = (parts.hostname or '').lower()
+    if parts.port and DEFAULT_PORTS.get(scheme) != parts.port:
+        host = '{}:{}'.format(host, parts.port)
+    query = urlencode(sorted(parse_qsl(parts.query, keep_blank_values=True)))
+    return urlunsplit((scheme, host, parts.path or '/', query, ''))
+
+
+class BloomFilter:
+    """
+    Compact set of seen items with a bounded false positive rate
+    """
+    def __init__(self, capacity: int = BLOOM_CAPACITY, error_rate: float = BLOOM_ERROR_RATE):
+        self.size = max(8, int(-capacity * math.log(error_rate) / math.log(2) ** 2))
+        self.hash_count = max(1, round(self.size / capacity * math.log(2)))
+        self.bits = bytearray((self.size + 7) // 8)
+
+    def _positions(self, item: str):
+        digest = hashlib.blake2b(item.encode('utf-8'), digest_size=16).digest()
+        first, second = int.from_bytes(digest[:8], 'little'), int.from_bytes(digest[8:], 'little')
+        return ((first + i * second) % self.size for i in range(self.hash_count))
+
+    def add(self, item: str):
+        """
+        Adds item to the filter
+        """
+        for position in self._positions(item):
+            self.bits[position >> 3] |= 1 << (position & 7)
+
+    def __contains__(self, item: str):
+        return all(self.bits[position >> 3] & (1 << (position & 7)) for position in self._positions(item))
+
+
+class UrlFrontier:
+    """
+    FIFO queue of (depth, url) pairs that keeps its head in memory and spills the tail to disk
+    """
+    def __init__(self, spill_path: str, max_in_memory: int = FRONTIER_MAX_IN_MEMORY):
+        self.spill_path = spill_path
+        self.max_in_memory = max_in_memory
+        self._head = deque()
+        self._spilled = 0
+        self._read_offset = 0
+        os.makedirs(os.path.dirname(spill_path), exist_ok=True)
+        self._truncate()
+
+    def __len__(self):
+        return len(self._head) + self._spilled
+
+    def __iter__(self):
+        yield from self._head
+        if not self._spilled:
+            return
+        with open(self.spill_path, encoding='utf-8') as file:
+            file.seek(self._read_offset)
+            for _ in range(self._spilled):
+                depth, url = file.readline().rstrip('\n').split('\t', 1)
+                yield int(depth), url
+
+    def push(self, depth: int, url: str):
+        """
+        Adds url to the end of the queue
+        """
+        # once something is spilled, new items go after it to keep FIFO order
+        if not self._spilled and len(self._head) < self.max_in_memory:
+            self._head.append((depth, url))
+            return
+        with open(self.spill_path, 'a', encoding='utf-8') as file:
+            file.write('{}\t{}\n'.format(depth, url))
+        self._spilled += 1
+
+    def pop(self):
+        """
+        Removes and returns the oldest (depth, url) pair
+        """
+        if not self._head and self._spilled:
+            self._refill()
+        return self._head.popleft()
+
+    def _refill(self):
+        with open(self.spill_path, encoding='utf-8') as file:
+            file.seek(self._read_offset)
+            while self._spilled and len(self._head) < self.max_in_memory:
+                depth, url = file.readline().rstrip('\n').split('\t', 1)
+                self._head.append((int(depth), url))
+                self._spilled -= 1
+            self._read_offset = file.tell()
+        if not self._spilled:
+            self._truncate()
+
+    def _truncate(self):
+        with open(self.spill_path, 'w', encoding='utf-8'):
+            self._read_offset = 0
@@ -1,36 +1,97 @@
 """
 Visualizer module for visualizing PosFrequencyPipeline results
 """
+import os
+from concurrent.futures import FIRST_COMPLETED, ProcessPoolExecutor, wait
+from itertools import islice
+
 import numpy as np
-import matplotlib.pyplot as plt
+from matplotlib.backends.backend_agg import FigureCanvasAgg
+from matplotlib.figure import Figure
+
+COLORS = ('b', 'g', 'r', 'c')
+# number of images rendered by a worker process per task
+RENDER_BATCH_SIZE = 100
+# number of batches submitted to the pool per worker process, the rest are not read from items until they finish
+BATCHES_PER_WORKER = 2
+# figure reused by all tasks of a worker process
+_WORKER_STATE = {}
+
+
+def _create_figure() -> Figure:
+    """
+    Creates a figure drawn by the Agg canvas, it is not registered in pyplot and is freed with its last reference
+    """
+    figure = Figure()
+    FigureCanvasAgg(figure)
+    return figure
+
+
+def _draw(figure: Figure, statistics: dict):
+    """
+    Draws bars of all tags at once, the most frequent tag first
+    """
+    sorted_tags = sorted(statistics, key=statistics.get, reverse=True)
+    sorted_frequencies = [statistics[tag] for tag in sorted_tags]
+    x = np.arange(len(sorted_tags))
+
+    axis = figure.add_subplot(1, 1, 1)
+    axis.bar(x, sorted_frequencies,
+             align='center', width=0.5,
+             color=[COLORS[i % len(COLORS)] for i in range(len(sorted_tags))])
+    axis.set_xticks(x)
+    axis.set_xticklabels(sorted_tags, rotation=20)
+    axis.set_ylim(0, max(sorted_frequencies) + 1)
 
 
 def visualize(statistics: dict, path_to_save: str):
     """
     param: statistics is a dictionary with keys:POS tags, values:frequencies
     """
-    number_of_tags = len(statistics)
-    sorted_frequencies = sorted(statistics.values(), reverse=True)
-    sorted_tags = sorted(statistics, key=statistics.get, reverse=True)
+    figure = _create_figure()
+    _draw(figure, statistics)
+    figure.savefig(path_to_save)
+    figure.clear()
 
-    x = np.arange(number_of_tags)
-    colors = ('b', 'g', 'r', 'c')
 
-    figure = plt.figure()
-    axis = figure.add_subplot(1, 1, 1)
-    for i in range(0, number_of_tags):
-        axis.bar(x[i], sorted_frequencies[i],
-                 align='center', width=0.5,
-                 color=colors[i % len(colors)])
+def _init_worker():
+    _WORKER_STATE['figure'] = _create_figure()
 
-    axis.set_xticks(x)
-    axis.set_xticklabels(sorted_tags)
-    plt.setp(sorted_tags)
-    plt.xticks(rotation=20)
-    y_max = max(sorted_frequencies) + 1
-    plt.ylim(0, y_max)
 
-    plt.savefig(path_to_save)
+def _render_batch(batch: list) -> int:
+    """
+    Renders (statistics, path_to_save) pairs into the figure of the worker process
+    """
+    figure = _WORKER_STATE['figure']
+    for statistics, path_to_save in batch:
+        _draw(figure, statistics)
+        figure.savefig(path_to_save)
+        figure.clear()
+    return len(batch)
+
+
+def visualize_batch(items, workers: int = None) -> int:
+    """
+    Renders (statistics, path_to_save) pairs in a pool of processes, each one reusing a single figure.
+    Only a few batches per worker are in flight, so items are read as fast as they are rendered.
+    With one worker renders in the current process. Returns the number of rendered images
+    """
+    items = iter(items)
+    batches = iter(lambda: list(islice(items, RENDER_BATCH_SIZE)), [])
+    if workers == 1:
+        _init_worker()
+        return sum(map(_render_batch, batches))
+    window = BATCHES_PER_WORKER * (workers or os.cpu_count() or 1)
+    rendered = 0
+    with ProcessPoolExecutor(max_workers=workers, initializer=_init_worker) as executor:
+        running = set()
+        for batch in batches:
+            if len(running) >= window:
+                done, running = wait(running, return_when=FIRST_COMPLETED)
+                rendered += sum(future.result() for future in done)
+            running.add(executor.submit(_render_batch, batch))
+        rendered += sum(future.result() for future in wait(running).done)
+    return rendered
 
 
 if __name__ == "__main__":